@@ -4,17 +4,32 @@
 Reads a manually curated CSV (see data/raw/incidents_manual.csv), computes derived
 metrics (duration, severity, evidence labels), filters to the last N days, and
 writes processed CSV/JSON/GeoJSON artefacts consumed by the web app or other
-analytical tooling.
+analytical tooling, plus the coordinated-wave records from build_waves.py and
+the sharded search index from build_search_index.py.
+
+With ``--unified`` the curated CSV and the automated detections in
+public/incidents.json are combined: each source is parsed in its own process
+and sorted in bounded chunks spilled to temporary run files, the runs are
+k-way merged newest-first with heapq.merge, and reports of the same event at
+the same airport are collapsed in favour of the higher-priority source.
 """
 from __future__ import annotations
 
 import argparse
 import csv
+import heapq
 import json
-from dataclasses import dataclass, asdict
+import sys
+import tempfile
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from build_search_index import docs_from_dataset, write_search_index
+from build_waves import ICAO_COUNTRIES, detect_waves, points_from_dataset, write_waves
 
 # ---------------------------------------------------------------------------
 # Configuration helpers
@@ -88,6 +103,14 @@ class Incident:
         }
         return row
 
+    @classmethod
+    def from_row(cls, row: dict) -> "Incident":
+        """Inverse of to_row(); derived display columns are ignored."""
+        values = {f.name: row[f.name] for f in fields(cls)}
+        values["date_start_utc"] = parse_datetime(values["date_start_utc"])
+        values["date_end_utc"] = parse_datetime(values["date_end_utc"])
+        return cls(**values)
+
 
 # ---------------------------------------------------------------------------
 # Core logic
@@ -157,8 +180,7 @@ def severity_label(score: int) -> str:
     return "low"
 
 
-def load_incidents(path: Path) -> List[Incident]:
-    incidents: List[Incident] = []
+def iter_csv_incidents(path: Path) -> Iterator[Incident]:
     with path.open(newline="", encoding="utf-8") as fh:
         reader = csv.DictReader(fh)
         for row in reader:
@@ -166,32 +188,34 @@ def load_incidents(path: Path) -> List[Incident]:
             end = parse_datetime(row["date_end_utc"])
             duration_min = compute_duration_minutes(start, end)
             severity = severity_from_row(row, duration_min)
-            incidents.append(
-                Incident(
-                    id=row["id"].strip(),
-                    date_start_utc=start,
-                    date_end_utc=end,
-                    country=row["country"].strip(),
-                    airport_name=row["airport_name"].strip(),
-                    iata=row.get("iata", "").strip(),
-                    icao=row.get("icao", "").strip(),
-                    lat=float(row["lat"]),
-                    lon=float(row["lon"]),
-                    airport_category=row.get("airport_category", "").strip(),
-                    incident_type=row["incident_type"].strip().lower(),
-                    uav_count=parse_int(row.get("uav_count")),
-                    uav_characteristics=row.get("uav_characteristics") or None,
-                    response=row.get("response") or None,
-                    source_primary_url=row.get("source_primary_url") or None,
-                    source_secondary_url=row.get("source_secondary_url") or None,
-                    evidence_strength=int(row.get("evidence_strength", 0) or 0),
-                    attribution=row.get("attribution") or None,
-                    notes=row.get("notes") or None,
-                    duration_min=duration_min,
-                    severity=severity,
-                    severity_label=severity_label(severity),
-                )
+            yield Incident(
+                id=row["id"].strip(),
+                date_start_utc=start,
+                date_end_utc=end,
+                country=row["country"].strip(),
+                airport_name=row["airport_name"].strip(),
+                iata=row.get("iata", "").strip(),
+                icao=row.get("icao", "").strip(),
+                lat=float(row["lat"]),
+                lon=float(row["lon"]),
+                airport_category=row.get("airport_category", "").strip(),
+                incident_type=row["incident_type"].strip().lower(),
+                uav_count=parse_int(row.get("uav_count")),
+                uav_characteristics=row.get("uav_characteristics") or None,
+                response=row.get("response") or None,
+                source_primary_url=row.get("source_primary_url") or None,
+                source_secondary_url=row.get("source_secondary_url") or None,
+                evidence_strength=int(row.get("evidence_strength", 0) or 0),
+                attribution=row.get("attribution") or None,
+                notes=row.get("notes") or None,
+                duration_min=duration_min,
+                severity=severity,
+                severity_label=severity_label(severity),
             )
+
+
+def load_incidents(path: Path) -> List[Incident]:
+    incidents = list(iter_csv_incidents(path))
     incidents.sort(key=lambda inc: inc.date_start_utc, reverse=True)
     return incidents
 
@@ -246,23 +270,251 @@ def write_summary(path: Path, incidents: Sequence[Incident], as_of: datetime) ->
         json.dump(summary, fh, ensure_ascii=False, indent=2)
 
 
+# ---------------------------------------------------------------------------
+# Unified build (k-way merge)
+# ---------------------------------------------------------------------------
+
+CHUNK_SIZE = 50_000
+CONFLICT_WINDOW = timedelta(hours=12)
+FILLABLE_FIELDS = ("uav_count", "uav_characteristics", "response", "source_primary_url",
+                   "source_secondary_url", "attribution", "notes")
+
+Item = Tuple[datetime, int, Incident]
+
+
+@dataclass
+class Source:
+    kind: str  # "csv" (curated) or "ingest" (public/incidents.json)
+    path: Path
+    priority: int  # lower wins when two sources report the same event
+
+
+def iter_ingest_records(path: Path) -> Iterator[dict]:
+    """Stream records from an incidents.json written one incident per line.
+
+    In that layout (records.dump_document) every line between ``"incidents": [``
+    and the closing ``]`` is one whole JSON object; a line there that does not
+    parse as one raises ValueError. Pretty-printed or single-line documents
+    have no such lines and are parsed whole instead.
+    """
+    in_list = streamed = False
+    with path.open(encoding="utf-8") as fh:
+        for lineno, raw in enumerate(fh, start=1):
+            line = raw.strip()
+            if not in_list:
+                in_list = line == '"incidents": ['
+                continue
+            if line in ("]", "],"):
+                return
+            if line == "{" and not streamed:
+                break  # pretty-printed: records span several lines
+            try:
+                record = json.loads(line.rstrip(","))
+            except ValueError as exc:
+                raise ValueError(f"{path}:{lineno}: unreadable incident line ({exc})") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}:{lineno}: incident line is not a JSON object")
+            streamed = True
+            yield record
+    if streamed:
+        raise ValueError(f"{path}: incidents list is not closed (truncated file?)")
+    yield from json.loads(path.read_text(encoding="utf-8")).get("incidents", [])
+
+
+def incident_from_ingest(record: dict) -> Incident | None:
+    """Map an ingest record onto the Incident model, scored like curated rows."""
+    asset = record.get("asset") or {}
+    detail = record.get("incident") or {}
+    evidence = record.get("evidence") or {}
+    if not record.get("id"):
+        print(f"[warn] skipping ingest record without id (first seen {record.get('first_seen_utc')}, "
+              f"asset {asset.get('name')!r})", file=sys.stderr)
+        return None
+    if asset.get("lat") is None or asset.get("lon") is None or not record.get("first_seen_utc"):
+        return None
+    start = parse_datetime(record["first_seen_utc"])
+    end = parse_datetime(record.get("last_update_utc") or record["first_seen_utc"])
+    duration_min = compute_duration_minutes(start, end, parse_int(str(detail.get("duration_min") or "")))
+    end = max(end, start + timedelta(minutes=duration_min))
+    category = "harbour" if asset.get("type") == "harbour" else ""
+    incident_type = str(detail.get("category") or "sighting").lower()
+    severity = severity_from_row({"incident_type": incident_type, "airport_category": category}, duration_min)
+    response = detail.get("response")
+    if isinstance(response, list):
+        response = ", ".join(str(item) for item in response)
+    urls = [src["url"] for src in evidence.get("sources") or [] if isinstance(src, dict) and src.get("url")]
+    icao = asset.get("icao") or ""
+    return Incident(
+        id=str(record["id"]),
+        date_start_utc=start,
+        date_end_utc=end,
+        country=record.get("country") or ICAO_COUNTRIES.get(icao[:2].upper(), ""),
+        airport_name=asset.get("name") or "",
+        iata=asset.get("iata") or "",
+        icao=icao,
+        lat=float(asset["lat"]),
+        lon=float(asset["lon"]),
+        airport_category=category,
+        incident_type=incident_type,
+        uav_count=detail.get("uav_count"),
+        uav_characteristics=detail.get("uav_characteristics") or None,
+        response=response or None,
+        source_primary_url=urls[0] if urls else None,
+        source_secondary_url=urls[1] if len(urls) > 1 else None,
+        evidence_strength=int(evidence.get("strength") or 0),
+        attribution=evidence.get("attribution") or None,
+        notes=detail.get("narrative") or None,
+        duration_min=duration_min,
+        severity=severity,
+        severity_label=severity_label(severity),
+    )
+
+
+def _spill(chunk: List[Incident], path: Path) -> Path:
+    chunk.sort(key=lambda inc: inc.date_start_utc, reverse=True)
+    with path.open("w", encoding="utf-8") as fh:
+        for incident in chunk:
+            fh.write(json.dumps(incident.to_row(), ensure_ascii=False) + "\n")
+    return path
+
+
+def write_sorted_runs(source: Source, chunk_size: int, run_dir: Path) -> Tuple[int, List[Path]]:
+    """Parse one source into newest-first run files of at most ``chunk_size`` incidents."""
+    if source.kind == "csv":
+        incidents: Iterable[Incident] = iter_csv_incidents(source.path)
+    elif source.kind == "ingest":
+        incidents = filter(None, map(incident_from_ingest, iter_ingest_records(source.path)))
+    else:
+        raise ValueError(f"unknown source kind {source.kind!r}")
+    stem = f"{source.priority:02d}-{source.kind}"
+    runs: List[Path] = []
+    chunk: List[Incident] = []
+    count = 0
+    for incident in incidents:
+        chunk.append(incident)
+        count += 1
+        if len(chunk) >= chunk_size:
+            runs.append(_spill(chunk, run_dir / f"{stem}-{len(runs):04d}.jsonl"))
+            chunk = []
+    if chunk:
+        runs.append(_spill(chunk, run_dir / f"{stem}-{len(runs):04d}.jsonl"))
+    return count, runs
+
+
+def read_run(path: Path, priority: int) -> Iterator[Item]:
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            incident = Incident.from_row(json.loads(line))
+            yield incident.date_start_utc, priority, incident
+
+
+def asset_key(incident: Incident) -> str:
+    return (incident.icao or incident.iata or incident.airport_name).strip().lower()
+
+
+def fill_missing(winner: Incident, loser: Incident) -> Incident:
+    if not winner.source_secondary_url and loser.source_primary_url != winner.source_primary_url:
+        winner.source_secondary_url = loser.source_primary_url
+    for name in FILLABLE_FIELDS:
+        if getattr(winner, name) in (None, ""):
+            setattr(winner, name, getattr(loser, name))
+    return winner
+
+
+def resolve_conflicts(merged: Iterable[Item], window: timedelta = CONFLICT_WINDOW) -> Iterator[Incident]:
+    """Collapse cross-source reports of one event at one asset within ``window``.
+
+    ``merged`` must be newest first. Only incidents inside the window are held,
+    so memory is bounded by the busiest ``window`` rather than the dataset.
+    """
+    pending: deque = deque()  # [start, priority, incident, priorities seen], arrival order
+    by_asset: Dict[str, deque] = defaultdict(deque)
+    for start, priority, incident in merged:
+        while pending and pending[0][0] - start > window:
+            done = pending.popleft()
+            key = asset_key(done[2])
+            by_asset[key].popleft()
+            if not by_asset[key]:
+                del by_asset[key]
+            yield done[2]
+        key = asset_key(incident)
+        # Rows from the same source are distinct reports; only cross-source matches collapse.
+        match = next((entry for entry in by_asset.get(key, ()) if priority not in entry[3]), None)
+        if match is None:
+            entry = [start, priority, incident, {priority}]
+            pending.append(entry)
+            by_asset[key].append(entry)
+            continue
+        match[3].add(priority)
+        if priority < match[1]:
+            match[1], match[2] = priority, fill_missing(incident, match[2])
+        else:
+            fill_missing(match[2], incident)
+    for entry in pending:
+        yield entry[2]
+
+
+def load_unified(
+    sources: Sequence[Source],
+    as_of: datetime,
+    days: int,
+    chunk_size: int = CHUNK_SIZE,
+    workers: Optional[int] = None,
+) -> List[Incident]:
+    """Merge ``sources`` newest first and return the incidents of the last ``days`` days.
+
+    Parsing and sorting hold at most ``chunk_size`` incidents per process, and
+    the merge holds one row per run plus the conflict window. The result list
+    itself is kept in memory because every writer reads it.
+    """
+    cutoff = as_of - timedelta(days=days)
+    with tempfile.TemporaryDirectory(prefix="drone-runs-") as tmp:
+        with ProcessPoolExecutor(max_workers=workers or len(sources)) as pool:
+            futures = [pool.submit(write_sorted_runs, src, chunk_size, Path(tmp)) for src in sources]
+            parsed = [future.result() for future in futures]
+        streams = [read_run(path, src.priority) for src, (_, runs) in zip(sources, parsed) for path in runs]
+        merged = heapq.merge(*streams, key=lambda item: (item[0], -item[1]), reverse=True)
+        resolved = 0
+        incidents: List[Incident] = []
+        for incident in resolve_conflicts(merged):
+            resolved += 1
+            if incident.date_start_utc >= cutoff:
+                incidents.append(incident)
+    total = sum(count for count, _ in parsed)
+    counts = ", ".join(f"{src.kind}: {count}" for src, (count, _) in zip(sources, parsed))
+    print(f"Merged {total} incidents ({counts}); {total - resolved} cross-source duplicates collapsed.")
+    # A collapsed event keeps its first-seen position; restore strict ordering.
+    incidents.sort(key=lambda inc: inc.date_start_utc, reverse=True)
+    return incidents
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
 
-def build_dataset(raw_csv: Path, output_dir: Path, days: int, as_of: datetime) -> None:
-    incidents = load_incidents(raw_csv)
-    filtered = filter_incidents(incidents, as_of=as_of, days=days)
+def build_dataset(raw_csv: Path, output_dir: Path, days: int, as_of: datetime,
+                  wave_radius_km: float = 500.0, wave_window_hours: float = 72.0,
+                  ingest_json: Optional[Path] = None, chunk_size: int = CHUNK_SIZE,
+                  workers: Optional[int] = None) -> None:
+    if ingest_json is not None:
+        sources = [Source("csv", raw_csv, 0), Source("ingest", ingest_json, 1)]
+        filtered = load_unified(sources, as_of, days, chunk_size, workers)
+    else:
+        incidents = load_incidents(raw_csv)
+        filtered = filter_incidents(incidents, as_of=as_of, days=days)
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
     write_csv(output_dir / "incidents_last365.csv", filtered)
     write_json(output_dir / "incidents_last365.json", filtered)
+    write_search_index(output_dir / "search", docs_from_dataset(filtered))
     write_geojson(output_dir / "incidents_last365.geojson", filtered)
     write_summary(output_dir / "incidents_summary.json", filtered, as_of)
+    waves = detect_waves(points_from_dataset(filtered), wave_radius_km, wave_window_hours)
+    write_waves(output_dir / "incidents_waves.json", waves, wave_radius_km, wave_window_hours, as_of)
 
-    print(f"Generated {len(filtered)} incidents covering the last {days} days.")
+    print(f"Generated {len(filtered)} incidents covering the last {days} days ({len(waves)} waves).")
 
 
 def parse_args() -> argparse.Namespace:
@@ -275,6 +527,17 @@ def parse_args() -> argparse.Namespace:
                         help="Number of trailing days to include.")
     parser.add_argument("--as-of", type=str,
                         help="Override the as-of date (UTC) in ISO format, e.g. 2025-09-25T00:00:00Z")
+    parser.add_argument("--wave-radius-km", type=float, default=500.0,
+                        help="Distance within which incidents are linked into a wave.")
+    parser.add_argument("--wave-window-hours", type=float, default=72.0,
+                        help="Time gap within which incidents are linked into a wave.")
+    parser.add_argument("--unified", action="store_true",
+                        help="Merge the curated CSV with automated detections from --ingest-json.")
+    parser.add_argument("--ingest-json", type=Path, default=Path("public/incidents.json"),
+                        help="Ingest output merged in --unified mode (curated rows win conflicts).")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="Incidents per sorted run file in --unified mode.")
+    parser.add_argument("--workers", type=int, help="Parser processes in --unified mode (default: one per source).")
     return parser.parse_args()
 
 
@@ -285,7 +548,10 @@ def main() -> None:
     else:
         as_of = datetime.now(timezone.utc)
 
-    build_dataset(args.raw_csv, args.output_dir, args.days, as_of=as_of)
+    build_dataset(args.raw_csv, args.output_dir, args.days, as_of=as_of,
+                  wave_radius_km=args.wave_radius_km, wave_window_hours=args.wave_window_hours,
+                  ingest_json=args.ingest_json if args.unified else None,
+                  chunk_size=args.chunk_size, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Build a prefix-sharded inverted index over incidents for fast search.
+
+Tokens come from the airport/asset name, country, narrative/notes, UAV
+characteristics and source publishers. Each token maps to a sorted list of
+incident ordinals (positions in docs.json's ``ids``). Tokens are split into
+shards by their first two characters, so a query only loads the shard files
+for its own tokens instead of the whole dataset.
+
+Layout of the output directory::
+
+    docs.json       {"version", "count", "prefix_len", "ids": [...], "shards": [...]}
+    <prefix>.json   {"token": [ordinal, ...], ...}
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from build_waves import ICAO_COUNTRIES
+
+INDEX_VERSION = 1
+PREFIX_LEN = 2
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is", "it", "of", "on",
+    "or", "the", "to", "was", "were", "with",
+}
+_SPLIT = re.compile(r"[^0-9a-z]+")
+_SHARD_NAME = re.compile(r"[0-9a-z]{1,%d}" % PREFIX_LEN)
+# Letters NFKD leaves intact (no combining mark to strip), spelled the way they are usually typed in ASCII.
+_TRANSLITERATE = str.maketrans({
+    "ł": "l", "đ": "d", "ð": "d", "ø": "o", "ħ": "h", "ı": "i", "ŀ": "l", "ŧ": "t",
+    "ß": "ss", "æ": "ae", "œ": "oe", "þ": "th", "ĳ": "ij",
+})
+
+Doc = Tuple[str, List[str]]
+
+
+# ---------------------------------------------------------------------------
+# Tokenising
+# ---------------------------------------------------------------------------
+
+
+def normalise(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).translate(_TRANSLITERATE)
+
+
+def tokenize(text: str | None) -> List[str]:
+    if not text:
+        return []
+    return [tok for tok in _SPLIT.split(normalise(text)) if len(tok) >= 2 and tok not in STOPWORDS]
+
+
+def publisher_from_url(url: str | None) -> str | None:
+    if not url:
+        return None
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host or None
+
+
+def shard_name(token: str) -> str:
+    return token[:PREFIX_LEN]
+
+
+# ---------------------------------------------------------------------------
+# Adapters
+# ---------------------------------------------------------------------------
+
+
+def docs_from_dataset(incidents: Iterable) -> List[Doc]:
+    """Searchable fields of build_dataset.Incident objects (or their row dicts)."""
+    docs: List[Doc] = []
+    for inc in incidents:
+        row = inc if isinstance(inc, dict) else vars(inc)
+        fields = [
+            row.get("airport_name"), row.get("iata"), row.get("icao"), row.get("country"),
+            row.get("notes"), row.get("uav_characteristics"),
+            publisher_from_url(row.get("source_primary_url")),
+            publisher_from_url(row.get("source_secondary_url")),
+        ]
+        docs.append((str(row["id"]), [f for f in fields if f]))
+    return docs
+
+
+def docs_from_ingest(incidents: Iterable[dict]) -> List[Doc]:
+    """Searchable fields of public/incidents.json records."""
+    docs: List[Doc] = []
+    for inc in incidents:
+        asset = inc.get("asset") or {}
+        detail = inc.get("incident") or {}
+        fields = [
+            asset.get("name"), asset.get("iata"), asset.get("icao"),
+            inc.get("country") or ICAO_COUNTRIES.get((asset.get("icao") or "")[:2].upper()),
+            detail.get("narrative"), detail.get("uav_characteristics"),
+        ]
+        for source in (inc.get("evidence") or {}).get("sources") or []:
+            fields.append(source.get("publisher"))
+            fields.append(publisher_from_url(source.get("url")))
+        docs.append((str(inc["id"]), [f for f in fields if f]))
+    return docs
+
+
+# ---------------------------------------------------------------------------
+# Build & query
+# ---------------------------------------------------------------------------
+
+
+def build_postings(docs: List[Doc]) -> Dict[str, List[int]]:
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for ordinal, (_, fields) in enumerate(docs):
+        for token in sorted({tok for field in fields for tok in tokenize(str(field))}):
+            # Ordinals are visited in increasing order, so each list stays sorted.
+            postings[token].append(ordinal)
+    return postings
+
+
+def write_search_index(out_dir: Path, docs: List[Doc]) -> int:
+    """Write docs.json plus one shard per token prefix; returns the token count.
+
+    Only shards listed in the previous docs.json are removed, so other files in
+    ``out_dir`` are left alone.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in _previous_shards(out_dir):
+        (out_dir / f"{stale}.json").unlink(missing_ok=True)
+    shards: Dict[str, Dict[str, List[int]]] = defaultdict(dict)
+    postings = build_postings(docs)
+    for token in sorted(postings):
+        shards[shard_name(token)][token] = postings[token]
+    for prefix, entries in shards.items():
+        with (out_dir / f"{prefix}.json").open("w", encoding="utf-8") as fh:
+            json.dump(entries, fh, separators=(",", ":"))
+    manifest = {
+        "version": INDEX_VERSION,
+        "count": len(docs),
+        "prefix_len": PREFIX_LEN,
+        "ids": [doc_id for doc_id, _ in docs],
+        "shards": sorted(shards),
+    }
+    with (out_dir / "docs.json").open("w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, separators=(",", ":"))
+    return len(postings)
+
+
+def _previous_shards(out_dir: Path) -> List[str]:
+    try:
+        manifest = json.loads((out_dir / "docs.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    shards = manifest.get("shards") if isinstance(manifest, dict) else None
+    # Manifest entries are two-character prefixes; anything else is not ours to delete.
+    return [s for s in shards or [] if isinstance(s, str) and _SHARD_NAME.fullmatch(s)]
+
+
+class SearchIndex:
+    """Reader that loads docs.json once and shard files on demand."""
+
+    def __init__(self, index_dir: Path) -> None:
+        self.index_dir = index_dir
+        self.manifest = json.loads((index_dir / "docs.json").read_text(encoding="utf-8"))
+        self.shards = set(self.manifest["shards"])
+        self._loaded: Dict[str, Dict[str, List[int]]] = {}
+        self._expanded: Dict[str, List[int]] = {}
+
+    def _shard(self, prefix: str) -> Dict[str, List[int]]:
+        if prefix not in self._loaded:
+            path = self.index_dir / f"{prefix}.json"
+            self._loaded[prefix] = json.loads(path.read_text(encoding="utf-8")) if prefix in self.shards else {}
+        return self._loaded[prefix]
+
+    def postings(self, token: str, prefix: bool = False) -> List[int]:
+        shard = self._shard(shard_name(token))
+        if not prefix:
+            return shard.get(token, [])
+        if token not in self._expanded:
+            merged = set()
+            for key, ordinals in shard.items():
+                if key.startswith(token):
+                    merged.update(ordinals)
+            self._expanded[token] = sorted(merged)
+        return self._expanded[token]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """AND query over all tokens; the last token also matches as a prefix (type-ahead)."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        lists = [self.postings(tok, prefix=(i == len(tokens) - 1)) for i, tok in enumerate(tokens)]
+        lists.sort(key=len)
+        shortest, rest = lists[0], lists[1:]
+        ids = self.manifest["ids"]
+        hits: List[str] = []
+        # Probe the shortest list into the longer ones (O(k log n)), stopping at ``limit``.
+        for ordinal in shortest:
+            if all(_contains(other, ordinal) for other in rest):
+                hits.append(ids[ordinal])
+                if limit and len(hits) >= limit:
+                    break
+        return hits
+
+
+def _contains(sorted_list: List[int], value: int) -> bool:
+    i = bisect_left(sorted_list, value)
+    return i < len(sorted_list) and sorted_list[i] == value
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build or query the incident search index.")
+    parser.add_argument("input", type=Path, nargs="?", default=Path("public/incidents.json"),
+                        help="public/incidents.json or a processed incidents_*.json file.")
+    parser.add_argument("-o", "--output-dir", type=Path, default=Path("public/search"),
+                        help="Directory for docs.json and the shard files.")
+    parser.add_argument("-q", "--query", help="Query an existing index instead of building one.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.query:
+        index = SearchIndex(args.output_dir)
+        started = time.perf_counter()
+        hits = index.search(args.query)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{len(hits)} hits in {elapsed:.2f} ms")
+        for doc_id in hits[:20]:
+            print(doc_id)
+        return
+    doc = json.loads(args.input.read_text(encoding="utf-8"))
+    docs = docs_from_ingest(doc["incidents"]) if isinstance(doc, dict) else docs_from_dataset(doc)
+    tokens = write_search_index(args.output_dir, docs)
+    print(f"Indexed {len(docs)} incidents ({tokens} tokens) -> {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Detect coordinated incident waves (clusters in space and time).
+
+Incidents are bucketed into a lat/lon grid whose cells are at least
+``radius_km`` wide, combined with time bins ``window_hours`` long. Only
+incidents in neighbouring buckets are compared, and matches are joined with
+union-find, so the pass costs roughly O(n · bucket occupancy) rather than O(n²).
+Works on the ingest document (public/incidents.json) and on the processed
+dataset written by build_dataset.py.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+EARTH_RADIUS_KM = 6371.0
+
+# ICAO location-indicator prefixes -> country, for ingest records without one.
+ICAO_COUNTRIES = {
+    "BI": "Iceland", "EB": "Belgium", "ED": "Germany", "EE": "Estonia", "EF": "Finland", "EG": "United Kingdom",
+    "EH": "Netherlands", "EI": "Ireland", "EK": "Denmark", "EL": "Luxembourg", "EN": "Norway", "EP": "Poland",
+    "ES": "Sweden", "ET": "Germany", "EV": "Latvia", "EY": "Lithuania", "LA": "Albania", "LB": "Bulgaria",
+    "LC": "Cyprus", "LD": "Croatia", "LE": "Spain", "LF": "France", "LG": "Greece", "LH": "Hungary",
+    "LI": "Italy", "LJ": "Slovenia", "LK": "Czechia", "LM": "Malta", "LO": "Austria", "LP": "Portugal",
+    "LQ": "Bosnia and Herzegovina", "LR": "Romania", "LS": "Switzerland", "LU": "Moldova",
+    "LW": "North Macedonia", "LY": "Serbia", "LZ": "Slovakia", "UK": "Ukraine", "UM": "Belarus",
+}
+
+
+@dataclass
+class Point:
+    id: str
+    time: datetime
+    lat: float
+    lon: float
+    country: str | None
+    severity: int
+
+
+# ---------------------------------------------------------------------------
+# Adapters
+# ---------------------------------------------------------------------------
+
+
+def parse_time(value: str) -> datetime:
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def points_from_ingest(incidents: Iterable[dict]) -> List[Point]:
+    """Points from public/incidents.json records (nested asset/scores dicts)."""
+    points: List[Point] = []
+    for inc in incidents:
+        asset = inc.get("asset") or {}
+        if asset.get("lat") is None or asset.get("lon") is None or not inc.get("first_seen_utc"):
+            continue
+        icao = (asset.get("icao") or "")[:2].upper()
+        points.append(Point(
+            id=str(inc["id"]),
+            time=parse_time(inc["first_seen_utc"]),
+            lat=float(asset["lat"]),
+            lon=float(asset["lon"]),
+            country=inc.get("country") or ICAO_COUNTRIES.get(icao),
+            severity=int((inc.get("scores") or {}).get("severity") or 1),
+        ))
+    return points
+
+
+def points_from_dataset(incidents: Iterable) -> List[Point]:
+    """Points from build_dataset.Incident objects or their to_row() dicts."""
+    points: List[Point] = []
+    for inc in incidents:
+        row = inc if isinstance(inc, dict) else vars(inc)
+        start = row["date_start_utc"]
+        points.append(Point(
+            id=str(row["id"]),
+            time=start if isinstance(start, datetime) else parse_time(start),
+            lat=float(row["lat"]),
+            lon=float(row["lon"]),
+            country=row.get("country") or None,
+            severity=int(row.get("severity") or 1),
+        ))
+    return points
+
+
+# ---------------------------------------------------------------------------
+# Clustering
+# ---------------------------------------------------------------------------
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dlat = p2 - p1
+    dlon = math.radians(lon2 - lon1)
+    h = math.sin(dlat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, h)))
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster(points: Sequence[Point], radius_km: float, window_hours: float) -> List[List[Point]]:
+    """Single-linkage clusters: two incidents link if within radius_km and window_hours."""
+    if not points:
+        return []
+    # Cells must span at least radius_km of great-circle distance (measured on the
+    # same sphere as haversine_km), plus 1% slack for rounding at cell edges.
+    # Two points within d at |lat| <= L differ in longitude by at most
+    # 2·asin(sin(d/2R) / cos L), which is wider than the parallel arc d / (R cos L).
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM) * 1.01
+    max_lat = max(abs(p.lat) for p in points)
+    spread = math.sin(radius_km / (2 * EARTH_RADIUS_KM)) / max(math.cos(math.radians(max_lat)), 1e-9)
+    min_dlon = math.degrees(2 * math.asin(spread)) * 1.01 if spread < 1 else 360.0
+    # Whole columns around the globe, so neighbours wrap across the antimeridian.
+    columns = max(1, int(360.0 // min_dlon))
+    dlon = 360.0 / columns
+    window_s = window_hours * 3600.0
+
+    buckets: Dict[Tuple[int, int, int], List[int]] = {}
+    keys: List[Tuple[int, int, int]] = []
+    for i, p in enumerate(points):
+        column = math.floor((p.lon + 180.0) / dlon) % columns
+        key = (math.floor(p.lat / dlat), column, math.floor(p.time.timestamp() / window_s))
+        keys.append(key)
+        buckets.setdefault(key, []).append(i)
+
+    parent = list(range(len(points)))
+    for i, (gy, gx, gt) in enumerate(keys):
+        a = points[i]
+        neighbour_columns = {(gx + dx) % columns for dx in (-1, 0, 1)}
+        for dy in (-1, 0, 1):
+            for cx in neighbour_columns:
+                for dt in (-1, 0, 1):
+                    for j in buckets.get((gy + dy, cx, gt + dt), ()):
+                        if j <= i:
+                            continue
+                        b = points[j]
+                        if abs((a.time - b.time).total_seconds()) > window_s:
+                            continue
+                        if haversine_km(a.lat, a.lon, b.lat, b.lon) > radius_km:
+                            continue
+                        ri, rj = _find(parent, i), _find(parent, j)
+                        if ri != rj:
+                            parent[rj] = ri
+
+    groups: Dict[int, List[Point]] = {}
+    for i, p in enumerate(points):
+        groups.setdefault(_find(parent, i), []).append(p)
+    return list(groups.values())
+
+
+def detect_waves(
+    points: Sequence[Point],
+    radius_km: float = 500.0,
+    window_hours: float = 72.0,
+    min_members: int = 2,
+) -> List[dict]:
+    waves = []
+    for members in cluster(points, radius_km, window_hours):
+        if len(members) < min_members:
+            continue
+        members.sort(key=lambda p: p.time)
+        start, end = members[0].time, members[-1].time
+        waves.append({
+            "id": f"wave-{start.strftime('%Y%m%d%H%M')}-{members[0].id}",
+            "start_utc": start.strftime(ISO_FORMAT),
+            "end_utc": end.strftime(ISO_FORMAT),
+            "span_hours": round((end - start).total_seconds() / 3600.0, 1),
+            "member_count": len(members),
+            "member_ids": [p.id for p in members],
+            "countries": sorted({p.country for p in members if p.country}),
+            "peak_severity": max(p.severity for p in members),
+            "centroid": [
+                round(sum(p.lat for p in members) / len(members), 4),
+                round(sum(p.lon for p in members) / len(members), 4),
+            ],
+        })
+    waves.sort(key=lambda w: w["start_utc"], reverse=True)
+    return waves
+
+
+def write_waves(path: Path, waves: List[dict], radius_km: float, window_hours: float,
+                generated_at: datetime | None = None) -> None:
+    payload = {
+        "generated_at": (generated_at or datetime.now(timezone.utc)).strftime(ISO_FORMAT),
+        "radius_km": radius_km,
+        "window_hours": window_hours,
+        "waves": waves,
+    }
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False, indent=2)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def load_points(path: Path) -> List[Point]:
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(doc, dict) and "incidents" in doc:
+        return points_from_ingest(doc["incidents"])
+    return points_from_dataset(doc)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Detect spatiotemporal incident waves.")
+    parser.add_argument("input", type=Path, nargs="?", default=Path("public/incidents.json"),
+                        help="public/incidents.json or a processed incidents_*.json file.")
+    parser.add_argument("-o", "--output", type=Path, default=Path("public/waves.json"),
+                        help="Where to write the wave records.")
+    parser.add_argument("--radius-km", type=float, default=500.0, help="Link incidents within this distance.")
+    parser.add_argument("--window-hours", type=float, default=72.0, help="Link incidents within this time gap.")
+    parser.add_argument("--min-members", type=int, default=2, help="Smallest cluster reported as a wave.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    points = load_points(args.input)
+    waves = detect_waves(points, args.radius_km, args.window_hours, args.min_members)
+    write_waves(args.output, waves, args.radius_km, args.window_hours)
+    print(f"Detected {len(waves)} waves across {len(points)} incidents -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Serve filtered, paginated incident queries over local HTTP.
+
+The processed dataset (data/processed/incidents_last365.json) is loaded once
+and indexed: incidents are ordered by start time so a date range is a bisect
+over one array, country and incident type map to posting lists, and a 1° grid
+answers bounding-box queries. A query scans only the smallest candidate list
+and checks the remaining filters per row, so response time follows the
+result size rather than the dataset size. Each incident is encoded once at
+load; responses are assembled from those pre-encoded rows.
+
+The file is re-stat'ed at most once per second and re-indexed when it changes.
+
+    GET /incidents?from=2025-09-01&to=2025-09-30&country=Denmark,Norway
+                  &type=closure&min_severity=3&bbox=8,54,16,58&limit=50&offset=0
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+GRID_DEG = 1.0
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+STAT_INTERVAL_S = 1.0
+
+Cell = Tuple[int, int]
+
+
+class QueryError(ValueError):
+    """Bad query parameters; reported to the client as HTTP 400."""
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+
+def parse_time(value: str, end_of_day: bool = False) -> float:
+    """ISO timestamp or date (UTC) -> epoch seconds.
+
+    With ``end_of_day`` a bare date means its last microsecond, so an inclusive
+    ``to=2025-09-24`` covers the whole day.
+    """
+    value = value.strip()
+    date_only = _is_date_only(value[:-1] if value.endswith("Z") else value)
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise QueryError(f"invalid timestamp {value!r}") from exc
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    if end_of_day and date_only:
+        dt = dt.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return dt.timestamp()
+
+
+def _is_date_only(value: str) -> bool:
+    """True if ``value`` is a calendar date with no time of day."""
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def grid_cell(lat: float, lon: float) -> Cell:
+    return math.floor(lat / GRID_DEG), math.floor(lon / GRID_DEG)
+
+
+class IncidentStore:
+    """Immutable indexed snapshot of one dataset file."""
+
+    def __init__(self, rows: Sequence[dict], mtime_ns: int = 0) -> None:
+        # Position in these arrays is the incident's rank by start time (oldest first).
+        keyed = sorted(((parse_time(row["date_start_utc"]), i) for i, row in enumerate(rows)))
+        ordered = [rows[i] for _, i in keyed]
+        self.mtime_ns = mtime_ns
+        self.times: List[float] = [t for t, _ in keyed]
+        self.countries: List[str] = [str(row.get("country") or "").lower() for row in ordered]
+        self.types: List[str] = [str(row.get("incident_type") or "").lower() for row in ordered]
+        self.severities: List[int] = [int(row.get("severity") or 0) for row in ordered]
+        self.coords: List[Tuple[float, float]] = [(float(row["lat"]), float(row["lon"])) for row in ordered]
+        self.encoded: List[bytes] = [json.dumps(row, ensure_ascii=False).encode("utf-8") for row in ordered]
+
+        self.by_country: Dict[str, List[int]] = defaultdict(list)
+        self.by_type: Dict[str, List[int]] = defaultdict(list)
+        self.grid: Dict[Cell, List[int]] = defaultdict(list)
+        for pos in range(len(ordered)):
+            # Positions are appended in increasing order, so every list stays sorted.
+            self.by_country[self.countries[pos]].append(pos)
+            self.by_type[self.types[pos]].append(pos)
+            self.grid[grid_cell(*self.coords[pos])].append(pos)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "IncidentStore":
+        mtime_ns = path.stat().st_mtime_ns
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(doc, list):
+            raise ValueError(f"{path} is not a processed incidents list")
+        return cls(doc, mtime_ns)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _bbox_candidates(self, bbox: Tuple[float, float, float, float]) -> List[int]:
+        west, south, east, north = bbox
+        (y0, x0), (y1, x1) = grid_cell(south, west), grid_cell(north, east)
+        if (y1 - y0 + 1) * (x1 - x0 + 1) <= len(self.grid):
+            cells = [(y, x) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+        else:
+            # Viewport larger than the populated area: walk occupied cells instead.
+            cells = [(y, x) for y, x in self.grid if y0 <= y <= y1 and x0 <= x <= x1]
+        return sorted(pos for cell in cells for pos in self.grid.get(cell, ()))
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        countries: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None,
+        min_severity: Optional[int] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        offset: int = 0,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Tuple[int, List[int]]:
+        """Return (total matches, positions for the requested page), newest first."""
+        lo = bisect_left(self.times, start) if start is not None else 0
+        hi = bisect_right(self.times, end) if end is not None else len(self.times)
+        if lo >= hi:
+            return 0, []
+
+        country_set = {c.lower() for c in countries} if countries else None
+        type_set = {t.lower() for t in types} if types else None
+        options: List[Sequence[int]] = [range(lo, hi)]
+        if country_set:
+            options.append(sorted(pos for c in country_set for pos in self.by_country.get(c, ())))
+        if type_set:
+            options.append(sorted(pos for t in type_set for pos in self.by_type.get(t, ())))
+        if bbox:
+            options.append(self._bbox_candidates(bbox))
+        candidates = min(options, key=len)
+
+        total = 0
+        page: List[int] = []
+        for pos in reversed(candidates):
+            if not lo <= pos < hi:
+                continue
+            if country_set and self.countries[pos] not in country_set:
+                continue
+            if type_set and self.types[pos] not in type_set:
+                continue
+            if min_severity is not None and self.severities[pos] < min_severity:
+                continue
+            if bbox:
+                lat, lon = self.coords[pos]
+                if not (bbox[1] <= lat <= bbox[3] and bbox[0] <= lon <= bbox[2]):
+                    continue
+            if offset <= total < offset + limit:
+                page.append(pos)
+            total += 1
+        return total, page
+
+
+class StoreHolder:
+    """Hands out the current store, re-indexing when the file's mtime changes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.store = IncidentStore.from_file(path)
+        self.checked = time.monotonic()
+        self.lock = threading.Lock()
+
+    def current(self) -> IncidentStore:
+        now = time.monotonic()
+        if now - self.checked < STAT_INTERVAL_S:
+            return self.store
+        with self.lock:
+            if now - self.checked >= STAT_INTERVAL_S:
+                self.checked = now
+                self._reload_if_changed()
+        return self.store
+
+    def _reload_if_changed(self) -> None:
+        try:
+            if self.path.stat().st_mtime_ns == self.store.mtime_ns:
+                return
+            # Build the new snapshot fully before swapping; readers keep the old one meanwhile.
+            self.store = IncidentStore.from_file(self.path)
+            print(f"[info] reloaded {self.path} ({len(self.store)} incidents)", file=sys.stderr)
+        except (OSError, ValueError, KeyError) as exc:
+            # Mid-write or malformed file: keep serving the last good snapshot.
+            print(f"[warn] reload of {self.path} failed: {exc}", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+def _csv_param(params: Dict[str, List[str]], name: str) -> Optional[List[str]]:
+    values = [v.strip() for raw in params.get(name, []) for v in raw.split(",") if v.strip()]
+    return values or None
+
+
+def _int_param(params: Dict[str, List[str]], name: str, default: Optional[int]) -> Optional[int]:
+    if name not in params:
+        return default
+    try:
+        return int(params[name][-1])
+    except ValueError as exc:
+        raise QueryError(f"{name} must be an integer") from exc
+
+
+def parse_query(query: str) -> dict:
+    params = parse_qs(query)
+    bbox = None
+    if "bbox" in params:
+        try:
+            bbox = tuple(float(v) for v in params["bbox"][-1].split(","))
+        except ValueError as exc:
+            raise QueryError("bbox must be four numbers") from exc
+        if not all(math.isfinite(v) for v in bbox):
+            raise QueryError("bbox must be four finite numbers")
+        if len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+            raise QueryError("bbox must be west,south,east,north")
+        # Clamp to the globe so an oversized viewport does not walk a huge cell range.
+        west, south, east, north = bbox
+        bbox = (max(west, -180.0), max(south, -90.0), min(east, 180.0), min(north, 90.0))
+    limit = _int_param(params, "limit", DEFAULT_LIMIT)
+    offset = _int_param(params, "offset", 0)
+    if not 1 <= limit <= MAX_LIMIT or offset < 0:
+        raise QueryError(f"limit must be 1..{MAX_LIMIT} and offset >= 0")
+    return {
+        "start": parse_time(params["from"][-1]) if "from" in params else None,
+        "end": parse_time(params["to"][-1], end_of_day=True) if "to" in params else None,
+        "countries": _csv_param(params, "country"),
+        "types": _csv_param(params, "type"),
+        "min_severity": _int_param(params, "min_severity", None),
+        "bbox": bbox,
+        "offset": offset,
+        "limit": limit,
+    }
+
+
+def make_handler(holder: StoreHolder) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            if url.path.rstrip("/") != "/incidents":
+                self._send(404, b'{"error":"not found"}')
+                return
+            try:
+                options = parse_query(url.query)
+            except QueryError as exc:
+                self._send(400, json.dumps({"error": str(exc)}).encode("utf-8"))
+                return
+            store = holder.current()
+            total, page = store.query(**options)
+            next_offset = options["offset"] + len(page)
+            head = json.dumps({
+                "total": total,
+                "offset": options["offset"],
+                "limit": options["limit"],
+                "next_offset": next_offset if next_offset < total else None,
+            })
+            body = head[:-1].encode("utf-8") + b',"incidents":[' + b",".join(store.encoded[p] for p in page) + b"]}"
+            self._send(200, body)
+
+        def log_message(self, format: str, *args) -> None:
+            print(f"[info] {self.address_string()} {format % args}", file=sys.stderr)
+
+    return Handler
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve indexed incident queries over local HTTP.")
+    parser.add_argument("dataset", type=Path, nargs="?", default=Path("data/processed/incidents_last365.json"),
+                        help="Processed incidents JSON written by build_dataset.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8001)))
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    holder = StoreHolder(args.dataset)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(holder))
+    print(f"Serving {len(holder.store)} incidents from {args.dataset} on http://{args.host}:{args.port}/incidents")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Harbour harvest against a local stand-in Overpass server.
+
+Run with ``python -m pytest tests`` (or ``python -m unittest discover tests``).
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools"))
+
+import build_assets  # noqa: E402
+
+WEST, EAST = build_assets.harbour_tiles(build_assets.EUROPE_BBOX, 1, 2)
+
+
+def tile_elements(tile):
+    south, west, north, east = tile
+    lat, lon = (south + north) / 2, (west + east) / 2
+    if tile == WEST:
+        return [
+            # Same numeric id, different OSM types: both must survive.
+            {"type": "node", "id": 123, "lat": lat, "lon": lon, "tags": {"harbour": "yes", "name": "Node harbour"}},
+            {"type": "way", "id": 123, "center": {"lat": lat + 1, "lon": lon}, "tags": {"name": "Way harbour"}},
+            {"type": "node", "id": 7, "lat": lat, "lon": lon + 1, "tags": {"name": "Shared"}},
+        ]
+    return [
+        {"type": "node", "id": 7, "lat": lat, "lon": lon, "tags": {"name": "Shared"}},
+        {"type": "relation", "id": 9, "center": {"lat": lat, "lon": lon + 1}, "tags": {"name": "Relation port"}},
+    ]
+
+
+class StandInOverpass:
+    """Serves tile responses; ``script`` maps a tile to a list of status codes to return first."""
+
+    def __init__(self) -> None:
+        self.requests: Counter = Counter()
+        self.script = {}
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                query = parse_qs(urlsplit(self.path).query)["data"][0]
+                box = tuple(float(v) for v in re.search(r"\(([-\d.,]+)\)", query).group(1).split(","))
+                tile = WEST if box == WEST else EAST
+                owner.requests[tile] += 1
+                queued = owner.script.get(tile, [])
+                status = queued.pop(0) if queued else 200
+                body = json.dumps({"elements": tile_elements(tile)} if status == 200 else {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/interpreter"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class HarbourHarvestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.asset_dir = Path(self.tmp.name)
+        self.saved = build_assets.ASSET_DIR, build_assets.TILE_DIR
+        build_assets.ASSET_DIR = self.asset_dir
+        build_assets.TILE_DIR = self.asset_dir / "_harbour_tiles"
+        self.overpass = StandInOverpass()
+
+    def tearDown(self) -> None:
+        self.overpass.close()
+        build_assets.ASSET_DIR, build_assets.TILE_DIR = self.saved
+        self.tmp.cleanup()
+
+    def harvest(self, retries: int = 2) -> None:
+        build_assets.download_harbours(rows=1, cols=2, workers=2, retries=retries, backoff=0.01,
+                                       endpoint=self.overpass.url, timeout=5)
+
+    def features(self):
+        doc = json.loads((self.asset_dir / "harbours.geojson").read_text(encoding="utf-8"))
+        return {(f["properties"]["osm_type"], f["properties"]["osm_id"]): f for f in doc["features"]}
+
+    def test_retries_on_429(self) -> None:
+        self.overpass.script[WEST] = [429, 429]
+        self.harvest()
+        self.assertEqual(self.overpass.requests[WEST], 3)
+        self.assertEqual(self.overpass.requests[EAST], 1)
+        self.assertIn(("node", 123), self.features())
+
+    def test_dedupes_on_element_type_and_id(self) -> None:
+        self.harvest()
+        features = self.features()
+        self.assertEqual(set(features), {("node", 123), ("way", 123), ("node", 7), ("relation", 9)})
+        self.assertEqual(features[("way", 123)]["properties"]["name"], "Way harbour")
+
+    def test_resumes_from_checkpoints(self) -> None:
+        self.overpass.script[EAST] = [503, 503]
+        self.harvest(retries=1)
+        self.assertTrue((build_assets.TILE_DIR / f"{build_assets.tile_key(WEST)}.json").exists())
+        self.assertFalse((build_assets.TILE_DIR / f"{build_assets.tile_key(EAST)}.json").exists())
+
+        self.harvest(retries=1)
+        # The checkpointed tile is not fetched again; the failed one is.
+        self.assertEqual(self.overpass.requests[WEST], 1)
+        self.assertEqual(self.overpass.requests[EAST], 3)
+        self.assertEqual(len(self.features()), 4)
+        self.assertEqual(list(build_assets.TILE_DIR.glob("*.json")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
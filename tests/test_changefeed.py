@@ -0,0 +1,134 @@
+"""Change feed delta, compaction and catch-up rules (tools/changefeed.py).
+
+Run with ``python -m pytest tests`` (or ``python -m unittest discover tests``).
+"""
+from __future__ import annotations
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools"))
+
+import changefeed  # noqa: E402
+
+
+def incident(uid: str, strength: int = 1) -> dict:
+    return {"id": uid, "evidence": {"strength": strength}}
+
+
+def read(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def catch_up(changes_dir: Path, state: dict, seq: int) -> tuple:
+    """Reference consumer: apply the feed to ``state`` (id -> incident) held at ``seq``."""
+    index = read(changes_dir / "index.json")
+    deltas = index["deltas"]
+    if not deltas or seq < deltas[0]["seq"] - 1:
+        snapshot = read(changes_dir / index["snapshot"]["path"])
+        state = {inc["id"]: inc for inc in snapshot["incidents"]}
+        seq = snapshot["seq"]
+    for entry in deltas:
+        if entry["seq"] <= seq:
+            continue
+        delta = read(changes_dir / entry["path"])
+        for uid in delta["deletes"]:
+            state.pop(uid, None)
+        for inc in delta["upserts"]:
+            state[inc["id"]] = inc
+        seq = delta["seq"]
+    return state, seq
+
+
+class ChangeFeedTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.incidents = []
+        self.before = {}
+        self.run = 0
+
+    def publish(self, incidents, compact_every: int = 3):
+        self.run += 1
+        with redirect_stdout(io.StringIO()):
+            seq = changefeed.publish_changes(incidents, self.before, f"2025-09-{self.run:02d}T00:00:00Z",
+                                             self.dir, compact_every)
+        self.before = changefeed.digests(incidents)
+        return seq
+
+    def test_first_run_writes_snapshot_then_deltas(self) -> None:
+        self.assertEqual(self.publish([incident("a")]), 1)
+        index = read(self.dir / "index.json")
+        self.assertEqual(index["snapshot"]["path"], "snapshot-000001.json")
+        self.assertEqual(index["deltas"], [])
+
+        self.assertEqual(self.publish([incident("a", 2), incident("b")]), 2)
+        delta = read(self.dir / "delta-000002.json")
+        self.assertEqual([inc["id"] for inc in delta["upserts"]], ["a", "b"])
+        self.assertEqual(delta["deletes"], [])
+
+    def test_unchanged_run_writes_nothing(self) -> None:
+        self.publish([incident("a")])
+        self.assertIsNone(self.publish([incident("a")]))
+        self.assertEqual(read(self.dir / "index.json")["latest_seq"], 1)
+
+    def test_withdrawn_incident_is_a_delete(self) -> None:
+        self.publish([incident("a"), incident("b")])
+        self.publish([incident("a")])
+        delta = read(self.dir / "delta-000002.json")
+        self.assertEqual(delta["upserts"], [])
+        self.assertEqual(delta["deletes"], ["b"])
+
+    def test_duplicate_ids_are_refused(self) -> None:
+        self.publish([incident("a")])
+        with self.assertRaises(ValueError):
+            self.publish([incident("a"), incident("a", 2)])
+
+    def test_compaction_keeps_delta_and_deltas_after_previous_snapshot(self) -> None:
+        self.publish([incident("a")])                   # seq 1: snapshot
+        for strength in (2, 3, 4):                      # seq 2..4; seq 4 compacts
+            self.publish([incident("a", strength)])
+        index = read(self.dir / "index.json")
+        self.assertEqual(index["snapshot"]["seq"], 4)
+        self.assertEqual([d["seq"] for d in index["deltas"]], [2, 3, 4])
+        self.assertTrue((self.dir / "delta-000004.json").exists())
+        self.assertFalse((self.dir / "snapshot-000001.json").exists())
+
+        for strength in (5, 6, 7):                      # seq 5..7; seq 7 compacts again
+            self.publish([incident("a", strength)])
+        index = read(self.dir / "index.json")
+        self.assertEqual(index["snapshot"]["seq"], 7)
+        self.assertEqual([d["seq"] for d in index["deltas"]], [5, 6, 7])
+        self.assertEqual(sorted(p.name for p in self.dir.glob("*.json")), [
+            "delta-000005.json", "delta-000006.json", "delta-000007.json", "index.json", "snapshot-000007.json",
+        ])
+
+    def test_consumers_at_any_sequence_catch_up(self) -> None:
+        history = []
+        expected = {}
+        for run in range(1, 12):
+            # Add one incident per run, bump "a", and withdraw "x" mid-way.
+            expected = {"a": incident("a", run)}
+            expected.update({f"i{n}": incident(f"i{n}") for n in range(run)})
+            if run < 6:
+                expected["x"] = incident("x")
+            seq = self.publish(list(expected.values()))
+            history.append((seq, dict(expected)))
+        latest = history[-1][0]
+        for seq, state in history:
+            caught_up, at = catch_up(self.dir, state, seq)
+            self.assertEqual(at, latest)
+            self.assertEqual(caught_up, expected, f"consumer at seq {seq}")
+        # A consumer from before the retained window falls back to the snapshot.
+        caught_up, at = catch_up(self.dir, {"stale": incident("stale")}, 0)
+        self.assertEqual(caught_up, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Article fetching against a local stand-in web server (tools/enrich.py).
+
+Run with ``python -m pytest tests`` (or ``python -m unittest discover tests``).
+"""
+from __future__ import annotations
+
+import io
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools"))
+
+import enrich  # noqa: E402
+
+PAGES = {
+    "/story": (200, "text/html", b"<html><body><p>Drone seen over the runway.</p></body></html>"),
+    "/report.pdf": (200, "application/pdf", b"%PDF-1.4"),
+    "/gone": (404, "text/html", b"not found"),
+    "/flaky": (503, "text/html", b"try later"),
+}
+
+
+class StandInSite:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.requests: Counter = Counter()
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with owner.lock:
+                    owner.requests[self.path] += 1
+                    owner.active += 1
+                    owner.peak = max(owner.peak, owner.active)
+                time.sleep(delay)
+                status, content_type, body = PAGES.get(self.path.split("?")[0], PAGES["/story"])
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with owner.lock:
+                    owner.active -= 1
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FetcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for patch in (mock.patch.object(enrich, "CACHE_DIR", Path(tmp.name)), mock.patch("sys.stderr", io.StringIO())):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def site(self, delay: float = 0.0) -> StandInSite:
+        site = StandInSite(delay)
+        self.addCleanup(site.close)
+        return site
+
+    def test_no_url_is_requested_twice_across_runs(self) -> None:
+        site = self.site()
+        urls = [site.base + path for path in ("/story", "/report.pdf", "/gone", "/flaky")]
+        for _ in range(2):  # two runs, each with a fresh fetcher
+            texts = enrich.Fetcher().fetch_many(urls)
+        self.assertEqual(texts[urls[0]], "Drone seen over the runway.")
+        self.assertEqual([texts[url] for url in urls[1:]], [None, None, None])
+        self.assertEqual(site.requests, Counter({"/story": 1, "/report.pdf": 1, "/gone": 1, "/flaky": 1}))
+
+    def test_transient_failure_is_retried_after_expiry(self) -> None:
+        site = self.site()
+        url = site.base + "/flaky"
+        enrich.Fetcher().fetch_text(url)
+        with mock.patch.object(enrich.time, "time", return_value=time.time() + enrich.MISS_RETRY_S + 1):
+            enrich.Fetcher().fetch_text(url)
+            enrich.Fetcher().fetch_text(site.base + "/gone")
+        self.assertEqual(site.requests["/flaky"], 2)
+        enrich.Fetcher().fetch_text(site.base + "/gone")
+        self.assertEqual(site.requests["/gone"], 1)
+
+    def test_per_host_limit_holds_across_concurrent_calls(self) -> None:
+        site = self.site(delay=0.1)
+        fetcher = enrich.Fetcher(per_host_limit=2)
+        batches = [[f"{site.base}/story?w={w}&n={n}" for n in range(4)] for w in range(4)]
+        threads = [threading.Thread(target=fetcher.fetch_many, args=(batch,)) for batch in batches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(site.requests.values()), 16)
+        self.assertLessEqual(site.peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+"""Unit tests for tools/ingest.py (no network; registries are patched in).
+
+Run with ``python -m pytest tests`` (or ``python -m unittest discover tests``).
+"""
+from __future__ import annotations
+
+import copy
+import io
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools"))
+
+import changefeed  # noqa: E402
+import ingest  # noqa: E402
+
+HARBOURS = [
+    {"name": "Hirtshals", "osm_id": 1, "lat": 57.59, "lon": 9.96},
+    {"name": "Frederikshavn", "osm_id": 2, "lat": 57.44, "lon": 10.54},
+    {"name": "Port of Aarhus", "osm_id": 3, "lat": 56.15, "lon": 10.22},
+]
+AIRPORTS = [
+    {"name": "Aalborg Airport", "iata": "AAL", "icao": "EKYY", "lat": 57.09, "lon": 9.85},
+    {"name": "Copenhagen Airport", "iata": "CPH", "icao": "EKCH", "lat": 55.62, "lon": 12.65},
+]
+
+
+class ResolveTitleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patches = [
+            mock.patch.object(ingest, "HARBOURS", HARBOURS),
+            mock.patch.object(ingest, "AIRPORTS", AIRPORTS),
+            mock.patch.object(ingest, "RESOLUTION_CACHE", ingest.ResolutionCache(None, "test")),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def uncached(self, title: str, kind: str):
+        with mock.patch.object(ingest, "RESOLUTION_CACHE", ingest.ResolutionCache(None, "fresh")):
+            return ingest.resolve_title(title, kind)
+
+    def test_place_name_suffix_is_not_served_from_another_place(self) -> None:
+        first = ingest.resolve_title("Drone spotted over ferry terminal - Hirtshals", "harbour")
+        second = ingest.resolve_title("Drone spotted over ferry terminal - Frederikshavn", "harbour")
+        self.assertEqual(first["name"], "Hirtshals")
+        self.assertEqual(second["name"], "Frederikshavn")
+        self.assertEqual(second, self.uncached("Drone spotted over ferry terminal - Frederikshavn", "harbour"))
+
+    def test_syndicated_copies_share_one_entry_and_agree_with_uncached_lookup(self) -> None:
+        cache = ingest.RESOLUTION_CACHE
+        base = "Drones halt traffic at Aalborg airport"
+        titles = [base, f"{base} - BBC", f"{base} - CNN", f"{base} | Reuters"]
+        results = [ingest.resolve_title(title, "airport") for title in titles]
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, len(titles) - 1)
+        for title, result in zip(titles, results):
+            self.assertEqual(result, self.uncached(title, "airport"))
+        self.assertEqual(results[0]["iata"], "AAL")
+
+    def test_iata_code_in_suffix_is_kept(self) -> None:
+        result = ingest.resolve_title("Drone sighting halts departures - CPH", "airport")
+        self.assertEqual(result["iata"], "CPH")
+        self.assertEqual(result, self.uncached("Drone sighting halts departures - CPH", "airport"))
+
+
+class CanonicalUrlTests(unittest.TestCase):
+    STORY = "https://dr.dk/nyheder/story"
+
+    def test_amp_variants(self) -> None:
+        for url in (
+            "https://www.google.com/amp/s/www.dr.dk/nyheder/story",
+            "https://www-dr-dk.cdn.ampproject.org/c/s/www.dr.dk/nyheder/story/amp",
+            "https://amp.dr.dk/nyheder/story.amp",
+            "https://dr.dk/nyheder/story?amp=1",
+        ):
+            self.assertEqual(ingest.canonical_url(url), self.STORY, url)
+
+    def test_tracking_parameters_are_dropped_and_the_rest_sorted(self) -> None:
+        self.assertEqual(ingest.canonical_url(f"{self.STORY}?utm_source=x&fbclid=1&at_medium=y"), self.STORY)
+        self.assertEqual(ingest.canonical_url(f"{self.STORY}?id=2&b=1&gclid=z"), f"{self.STORY}?b=1&id=2")
+
+    def test_scheme_host_port_and_fragment(self) -> None:
+        for url in (
+            "http://www.dr.dk/nyheder/story/",
+            "HTTPS://WWW.DR.DK/nyheder/story",
+            "https://dr.dk:443/nyheder/story",
+            "http://dr.dk:80/nyheder/story",
+            "https://m.dr.dk/nyheder/story#comments",
+        ):
+            self.assertEqual(ingest.canonical_url(url), self.STORY, url)
+        self.assertEqual(ingest.canonical_url("http://dr.dk:8080/nyheder/story"), "https://dr.dk:8080/nyheder/story")
+        self.assertEqual(ingest.canonical_url(""), "")
+
+
+class AbsorbTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patches = [
+            mock.patch.object(ingest, "AIRPORTS", AIRPORTS),
+            mock.patch.object(ingest, "RESOLUTION_CACHE", ingest.ResolutionCache(None, "test")),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def incident(self, url: str, seen: str):
+        article = {"title": "Drones close Aalborg Airport overnight", "url": url, "datetime": seen}
+        return ingest.build_incident(article, use_article_time=True)
+
+    def test_remerging_the_same_story_changes_nothing(self) -> None:
+        existing = [self.incident("https://dr.dk/nyheder/story", "2025-09-24T20:00:00Z")]
+        digest = changefeed.digests(existing)
+        # The next hourly window returns the same article (an AMP copy), seen later.
+        again = self.incident("https://www.google.com/amp/s/www.dr.dk/nyheder/story", "2025-09-24T21:00:00Z")
+        merged = ingest.merge_with_existing([again], copy.deepcopy(existing))
+        self.assertEqual(changefeed.digests(merged), digest)
+
+    def test_new_source_updates_timestamp_and_sources(self) -> None:
+        existing = [self.incident("https://dr.dk/nyheder/story", "2025-09-24T20:00:00Z")]
+        other = self.incident("https://tv2.dk/story", "2025-09-24T21:00:00Z")
+        merged = ingest.merge_with_existing([other], existing)
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(len(merged[0].evidence.sources), 2)
+        self.assertEqual(merged[0].last_update_utc, "2025-09-24T21:00:00Z")
+
+
+class GdeltThrottleTests(unittest.TestCase):
+    def test_concurrent_fetches_are_spaced(self) -> None:
+        starts = []
+
+        def fake_urlopen(url, timeout=None):
+            starts.append(time.monotonic())
+            return io.BytesIO(b'{"articles": []}')
+
+        with mock.patch.object(ingest, "urlopen", fake_urlopen), \
+                mock.patch.object(ingest, "GDELT_MIN_INTERVAL_S", 0.2):
+            threads = [threading.Thread(target=ingest.fetch_gdelt, kwargs={"strict": True}) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        starts.sort()
+        self.assertEqual(len(starts), 4)
+        self.assertTrue(all(b - a >= 0.19 for a, b in zip(starts, starts[1:])), starts)
+
+
+class IncidentIdTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patches = [
+            mock.patch.object(ingest, "AIRPORTS", AIRPORTS),
+            mock.patch.object(ingest, "RESOLUTION_CACHE", ingest.ResolutionCache(None, "test")),
+            # Both stories are built in the same second.
+            mock.patch.object(ingest.time, "time", return_value=1792371536.0),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def stories(self):
+        articles = [
+            {"title": "Drones close Aalborg Airport overnight", "url": "https://a.example/drones"},
+            {"title": "Police arrest man after Aalborg Airport runway incursion", "url": "https://b.example/arrest"},
+        ]
+        return [ingest.build_incident(article) for article in articles]
+
+    def test_dissimilar_stories_in_one_second_get_distinct_ids(self) -> None:
+        merged = ingest.merge_with_existing(ingest.dedupe_incidents(self.stories()), existing=[])
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(len({inc.id for inc in merged}), 2)
+
+    def test_legacy_duplicate_ids_are_healed_once(self) -> None:
+        existing = self.stories()
+        existing[1].id = existing[0].id  # as published before ids carried a source hash
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()), \
+                mock.patch("sys.stderr", io.StringIO()):
+            changes = Path(tmp)
+            changefeed.publish_changes([existing[0]], {}, "2025-09-01T00:00:00Z", changes)
+            seqs = []
+            for run in range(3):
+                before = changefeed.digests(existing)
+                existing = ingest.merge_with_existing([], existing)
+                seqs.append(changefeed.publish_changes(existing, before, f"2025-09-0{run + 2}T00:00:00Z", changes))
+                existing = copy.deepcopy(existing)
+        self.assertEqual(len({inc.id for inc in existing}), 2)
+        self.assertIsNotNone(seqs[0])
+        self.assertEqual(seqs[1:], [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Query parsing for the local incident service (scripts/serve_incidents.py).
+
+Run with ``python -m pytest tests`` (or ``python -m unittest discover tests``).
+"""
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import serve_incidents  # noqa: E402
+
+ROWS = [
+    {"id": "morning", "date_start_utc": "2025-09-24T06:00:00Z", "country": "Denmark", "lat": 57.09, "lon": 9.85},
+    {"id": "evening", "date_start_utc": "2025-09-24T19:44:00Z", "country": "Denmark", "lat": 57.09, "lon": 9.85},
+    {"id": "next-day", "date_start_utc": "2025-09-25T00:30:00Z", "country": "Denmark", "lat": 55.62, "lon": 12.65},
+]
+
+
+class ParseQueryTests(unittest.TestCase):
+    def ids(self, query: str):
+        store = serve_incidents.IncidentStore(ROWS)
+        _, page = store.query(**serve_incidents.parse_query(query))
+        return sorted(json.loads(store.encoded[pos])["id"] for pos in page)
+
+    def test_date_only_to_covers_the_whole_day(self) -> None:
+        for to in ("2025-09-24", "2025-09-24Z", "20250924"):
+            self.assertEqual(self.ids(f"from=2025-09-24&to={to}"), ["evening", "morning"], to)
+
+    def test_timestamp_to_is_exact(self) -> None:
+        self.assertEqual(self.ids("from=2025-09-24&to=2025-09-24T00:00:00Z"), [])
+        self.assertEqual(self.ids("to=2025-09-24T19:44:00Z"), ["evening", "morning"])
+
+    def test_non_finite_bbox_is_rejected(self) -> None:
+        for bbox in ("nan,54,16,58", "-inf,54,16,58", "8,54,inf,58"):
+            with self.assertRaises(serve_incidents.QueryError, msg=bbox):
+                serve_incidents.parse_query(f"bbox={bbox}")
+
+    def test_oversized_bbox_is_clamped(self) -> None:
+        options = serve_incidents.parse_query("bbox=-1e308,-1e308,1e308,1e308")
+        self.assertEqual(options["bbox"], (-180.0, -90.0, 180.0, 90.0))
+        self.assertEqual(self.ids("bbox=-1e308,-1e308,1e308,1e308"), ["evening", "morning", "next-day"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,19 +3,35 @@
 
 Airports: OurAirports CSV filtered to Europe (broad definition).
 Harbours: Overpass query grabbing harbours/ports/ferry terminals around Europe.
+The Europe bbox is split into a grid of tiles that are fetched concurrently with
+per-tile retry/backoff; finished tiles are checkpointed so an interrupted run
+resumes where it stopped.
 """
 from __future__ import annotations
 
+import argparse
 import csv
 import json
+import os
 import pathlib
+import random
 import sys
-from urllib.parse import quote
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
 from urllib.request import urlopen
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 ASSET_DIR = ROOT / "data" / "assets"
 ASSET_DIR.mkdir(parents=True, exist_ok=True)
+TILE_DIR = ASSET_DIR / "_harbour_tiles"
+
+OVERPASS_URL = os.environ.get("OVERPASS_URL", "https://overpass-api.de/api/interpreter")
+EUROPE_BBOX = (35.0, -15.0, 72.0, 40.0)  # south, west, north, east
+
+BBox = Tuple[float, float, float, float]
 
 EU_ISO = {
     "AL","AD","AT","BA","BE","BG","BY","CH","CY","CZ","DE","DK","EE","ES","FI","FO","FR","GB","GI","GR","HR",
@@ -45,51 +61,197 @@ def download_airports() -> None:
     print(f"Saved {len(filtered)} European airports -> {out_path}")
 
 
-def download_harbours() -> None:
-    overpass = """
-    [out:json][timeout:60];
-    (
-      node["harbour"](35,-15,72,40);
-      way["harbour"](35,-15,72,40);
-      relation["harbour"](35,-15,72,40);
-      node["amenity"="ferry_terminal"](35,-15,72,40);
-      way["amenity"="ferry_terminal"](35,-15,72,40);
-      relation["amenity"="ferry_terminal"](35,-15,72,40);
-      node["port"](35,-15,72,40);
-      way["port"](35,-15,72,40);
-      relation["port"](35,-15,72,40);
-    );
-    out center tags;
-    """
-    url = "https://overpass-api.de/api/interpreter?data=" + quote(overpass)
-    raw = urlopen(url, timeout=180).read().decode("utf-8", "ignore")
-    osm = json.loads(raw)
-    features = []
-    for element in osm.get("elements", []):
-        center = element.get("center", {})
-        lat = element.get("lat", center.get("lat"))
-        lon = element.get("lon", center.get("lon"))
-        if lat is None or lon is None:
-            continue
-        tags = element.get("tags", {})
-        name = tags.get("name") or tags.get("harbour") or tags.get("ref") or "Unnamed harbour"
-        features.append({
-            "type": "Feature",
-            "geometry": {"type": "Point", "coordinates": [float(lon), float(lat)]},
-            "properties": {
-                "osm_id": element.get("id"),
-                "name": name,
-                "tags": {k: v for k, v in tags.items() if k not in {"name", "harbour"}}
-            }
-        })
+def harbour_tiles(bbox: BBox, rows: int, cols: int) -> List[BBox]:
+    south, west, north, east = bbox
+    lat_step = (north - south) / rows
+    lon_step = (east - west) / cols
+    tiles: List[BBox] = []
+    for r in range(rows):
+        for c in range(cols):
+            tiles.append((
+                round(south + r * lat_step, 6),
+                round(west + c * lon_step, 6),
+                round(south + (r + 1) * lat_step, 6),
+                round(west + (c + 1) * lon_step, 6),
+            ))
+    return tiles
+
+
+def tile_key(tile: BBox) -> str:
+    return "_".join(f"{v:g}" for v in tile)
+
+
+def overpass_query(tile: BBox, timeout: int = 60) -> str:
+    box = ",".join(f"{v:g}" for v in tile)
+    selectors = ['["harbour"]', '["amenity"="ferry_terminal"]', '["port"]']
+    lines = [f"  {kind}{sel}({box});" for sel in selectors for kind in ("node", "way", "relation")]
+    return f"[out:json][timeout:{timeout}];\n(\n" + "\n".join(lines) + "\n);\nout center tags;\n"
+
+
+def element_to_feature(element: Dict[str, object]) -> Optional[Dict[str, object]]:
+    center = element.get("center", {})
+    lat = element.get("lat", center.get("lat"))
+    lon = element.get("lon", center.get("lon"))
+    if lat is None or lon is None:
+        return None
+    tags = element.get("tags", {})
+    name = tags.get("name") or tags.get("harbour") or tags.get("ref") or "Unnamed harbour"
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [float(lon), float(lat)]},
+        "properties": {
+            "osm_type": element.get("type"),
+            "osm_id": element.get("id"),
+            "name": name,
+            "tags": {k: v for k, v in tags.items() if k not in {"name", "harbour"}}
+        }
+    }
+
+
+def fetch_tile(tile: BBox, endpoint: str, retries: int, backoff: float, timeout: int) -> List[Dict[str, object]]:
+    """Fetch one tile from Overpass, retrying with exponential backoff + jitter."""
+    url = endpoint + "?" + urlencode({"data": overpass_query(tile, timeout)})
+    attempt = 0
+    while True:
+        try:
+            raw = urlopen(url, timeout=timeout + 30).read().decode("utf-8", "ignore")
+            osm = json.loads(raw)
+            # Overpass reports server-side timeouts in "remark" with a partial result.
+            remark = osm.get("remark") or ""
+            if "runtime error" in remark.lower():
+                raise RuntimeError(remark)
+            return [f for f in map(element_to_feature, osm.get("elements", [])) if f]
+        except (HTTPError, URLError, TimeoutError, ValueError, RuntimeError) as exc:
+            attempt += 1
+            if attempt > retries:
+                raise
+            if isinstance(exc, HTTPError) and exc.code not in {429, 500, 502, 503, 504}:
+                raise
+            delay = backoff * (2 ** (attempt - 1)) * (1 + random.random())
+            print(f"[warn] tile {tile_key(tile)} failed ({exc}); retry {attempt}/{retries} in {delay:.1f}s",
+                  file=sys.stderr)
+            time.sleep(delay)
+
+
+def load_checkpoint(tile: BBox) -> Optional[List[Dict[str, object]]]:
+    path = TILE_DIR / f"{tile_key(tile)}.json"
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+
+
+def save_checkpoint(tile: BBox, features: List[Dict[str, object]]) -> None:
+    TILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = TILE_DIR / f"{tile_key(tile)}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(features, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def feature_key(feature: Dict[str, object]) -> Tuple[object, object]:
+    # Node, way and relation ids are separate namespaces in OSM.
+    props = feature["properties"]
+    return props.get("osm_type"), props.get("osm_id")
+
+
+def in_bbox(feature: Dict[str, object], tile: BBox) -> bool:
+    lon, lat = feature["geometry"]["coordinates"]
+    return tile[0] <= lat <= tile[2] and tile[1] <= lon <= tile[3]
+
+
+def download_harbours(
+    rows: int = 4,
+    cols: int = 4,
+    workers: int = 4,
+    retries: int = 4,
+    backoff: float = 5.0,
+    endpoint: str = OVERPASS_URL,
+    timeout: int = 90,
+) -> None:
+    tiles = harbour_tiles(EUROPE_BBOX, rows, cols)
+    results: Dict[BBox, List[Dict[str, object]]] = {}
+    pending: List[BBox] = []
+    for tile in tiles:
+        cached = load_checkpoint(tile)
+        if cached is None:
+            pending.append(tile)
+        else:
+            results[tile] = cached
+    if results:
+        print(f"[info] resuming harbour harvest: {len(results)}/{len(tiles)} tiles checkpointed")
+
+    failed: List[BBox] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch_tile, tile, endpoint, retries, backoff, timeout): tile for tile in pending}
+        for future in as_completed(futures):
+            tile = futures[future]
+            try:
+                features = future.result()
+            except Exception as exc:
+                print(f"[warn] tile {tile_key(tile)} gave up: {exc}", file=sys.stderr)
+                failed.append(tile)
+                continue
+            save_checkpoint(tile, features)
+            results[tile] = features
+
     out_path = ASSET_DIR / "harbours.geojson"
+    merged: Dict[Tuple[object, object], Dict[str, object]] = {}
+    if failed and out_path.exists():
+        # Keep the previous snapshot for areas we could not refresh this run.
+        previous = json.loads(out_path.read_text(encoding="utf-8")).get("features", [])
+        for feature in previous:
+            if any(in_bbox(feature, tile) for tile in failed):
+                merged[feature_key(feature)] = feature
+    for tile in tiles:
+        for feature in results.get(tile, []):
+            merged[feature_key(feature)] = feature
+
+    features = list(merged.values())
     out_path.write_text(json.dumps({"type": "FeatureCollection", "features": features}, ensure_ascii=False), encoding="utf-8")
     print(f"Saved {len(features)} harbour/port features -> {out_path}")
 
+    if failed:
+        print(f"[warn] {len(failed)}/{len(tiles)} harbour tiles failed; rerun to resume", file=sys.stderr)
+        return
+    for tile in tiles:
+        (TILE_DIR / f"{tile_key(tile)}.json").unlink(missing_ok=True)
+
+
+def parse_grid(value: str) -> Tuple[int, int]:
+    try:
+        rows, cols = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("grid must look like ROWSxCOLS, e.g. 4x4")
+    if rows < 1 or cols < 1:
+        raise argparse.ArgumentTypeError("grid dimensions must be positive")
+    return rows, cols
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Download airport and harbour asset registries.")
+    parser.add_argument("--skip-airports", action="store_true", help="Only refresh harbours.geojson.")
+    parser.add_argument("--skip-harbours", action="store_true", help="Only refresh airports.csv.")
+    parser.add_argument("--grid", type=parse_grid, default=(4, 4),
+                        help="Split the Europe bbox into ROWSxCOLS Overpass tiles (default 4x4).")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent Overpass requests.")
+    parser.add_argument("--retries", type=int, default=4, help="Retries per tile before giving up.")
+    parser.add_argument("--backoff", type=float, default=5.0, help="Base backoff in seconds between retries.")
+    parser.add_argument("--overpass-url", default=OVERPASS_URL,
+                        help="Overpass interpreter endpoint (also read from $OVERPASS_URL).")
+    return parser.parse_args()
+
 
 def main() -> None:
-    download_airports()
-    download_harbours()
+    args = parse_args()
+    if not args.skip_airports:
+        download_airports()
+    if not args.skip_harbours:
+        rows, cols = args.grid
+        download_harbours(rows, cols, workers=args.workers, retries=args.retries,
+                          backoff=args.backoff, endpoint=args.overpass_url)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Sequenced change feed written next to public/incidents.json.
+
+Each ingest run that changes anything appends public/changes/delta-<seq>.json
+holding the upserted incidents and the ids of withdrawn ones. Every
+``compact_every`` sequences the run also writes a full snapshot. Deltas are
+kept back to the previous snapshot, so index.json always covers the last one
+to two compaction periods. A consumer holding sequence N applies the deltas
+with seq > N when N >= the first listed delta's seq - 1; otherwise it loads the
+snapshot and applies the deltas after it.
+
+Everything is keyed on incident ids, so they must be unique within a run
+(ingest.ensure_unique_ids enforces this before publishing).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from records import IncidentRecord, as_dict, incident_id
+
+ROOT = Path(__file__).resolve().parents[1]
+CHANGES_DIR = ROOT / "public" / "changes"
+COMPACT_EVERY = 24
+
+
+def incident_digest(incident: object) -> str:
+    if isinstance(incident, IncidentRecord):
+        raw = incident.to_json()
+    else:
+        raw = json.dumps(incident, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def digests(incidents: List[object]) -> Dict[str, str]:
+    """Fingerprint every incident by id, taken before the run mutates them."""
+    return {incident_id(inc): incident_digest(inc) for inc in incidents}
+
+
+def changed_incidents(incidents: List[object], before: Dict[str, str]) -> List[object]:
+    return [inc for inc in incidents if before.get(incident_id(inc)) != incident_digest(inc)]
+
+
+def load_index(changes_dir: Path) -> Dict[str, object]:
+    path = changes_dir / "index.json"
+    if not path.exists():
+        return {"latest_seq": 0, "generated_utc": None, "snapshot": None, "deltas": []}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_json(path: Path, payload: Dict[str, object]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def publish_changes(
+    incidents: List[object],
+    before: Dict[str, str],
+    generated_utc: str,
+    changes_dir: Path = CHANGES_DIR,
+    compact_every: int = COMPACT_EVERY,
+) -> Optional[int]:
+    """Append this run's upserts to the feed; returns the new sequence (None if nothing changed)."""
+    changes_dir.mkdir(parents=True, exist_ok=True)
+    index = load_index(changes_dir)
+    upserts = changed_incidents(incidents, before)
+    current_ids = {incident_id(inc) for inc in incidents}
+    if len(current_ids) != len(incidents):
+        raise ValueError("incident ids must be unique to publish a change feed")
+    # Previously published incidents that are gone now (e.g. withdrawn by validation).
+    deletes = sorted(uid for uid in before if uid not in current_ids)
+    if not upserts and not deletes and index["snapshot"]:
+        return None
+
+    seq = int(index["latest_seq"]) + 1
+    deltas: List[Dict[str, object]] = list(index["deltas"])
+    snapshot = index["snapshot"]
+    stale: List[str] = []
+
+    if snapshot is not None:
+        # Every run gets a delta, so consumers never have to refetch the whole history.
+        name = f"delta-{seq:06d}.json"
+        _write_json(changes_dir / name, {
+            "seq": seq,
+            "generated_utc": generated_utc,
+            "upserts": [as_dict(inc) for inc in upserts],
+            "deletes": deletes,
+        })
+        deltas.append({"seq": seq, "generated_utc": generated_utc, "path": name, "count": len(upserts)})
+
+    since_snapshot = sum(1 for d in deltas if snapshot and d["seq"] > snapshot["seq"])
+    if snapshot is None or since_snapshot >= compact_every:
+        name = f"snapshot-{seq:06d}.json"
+        _write_json(changes_dir / name, {"seq": seq, "generated_utc": generated_utc, "incidents": [as_dict(inc) for inc in incidents]})
+        if snapshot is not None:
+            # Drop only what predates the previous snapshot; its later deltas stay
+            # so consumers from the last period still catch up incrementally.
+            stale = [snapshot["path"]] + [d["path"] for d in deltas if d["seq"] <= snapshot["seq"]]
+            deltas = [d for d in deltas if d["seq"] > snapshot["seq"]]
+        snapshot = {"seq": seq, "generated_utc": generated_utc, "path": name, "count": len(incidents)}
+
+    _write_json(changes_dir / "index.json", {
+        "latest_seq": seq,
+        "generated_utc": generated_utc,
+        "snapshot": snapshot,
+        "deltas": deltas,
+    })
+    # Remove superseded files only after the index no longer points at them.
+    for old in stale:
+        (changes_dir / old).unlink(missing_ok=True)
+    print(f"[info] change feed seq {seq}: {len(upserts)} upserts, {len(deletes)} deletes ({name})")
+    return seq
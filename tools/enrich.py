@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Article body enrichment for Drone Sightings ingestion.
+
+Fetches the pages behind candidate articles concurrently (bounded globally and
+per host), extracts plain text with a cheap regex pass, and stores the result in
+a content-addressed cache under data/cache/articles so a URL is only ever
+downloaded once across runs. Failures are cached too: pages that will never
+yield text (non-HTML, 4xx) are not requested again, and transient errors are
+retried only after ``MISS_RETRY_S``.
+"""
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urldefrag, urlparse
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / "data" / "cache" / "articles"
+
+USER_AGENT = "dronez-ingest/1.0 (+https://dronez.vercel.app/)"
+MAX_BYTES = 512 * 1024
+MAX_TEXT_CHARS = 20000
+GLOBAL_LIMIT = 8
+PER_HOST_LIMIT = 2
+FETCH_TIMEOUT = 15
+MISS_RETRY_S = 24 * 3600  # transient failures (timeouts, 5xx, 429) are retried after a day
+
+DRONE_RE = re.compile(r"\b(drones?|uavs?|unmanned|dronen?|droner|drohnen?|dron[iy]?)\b", re.IGNORECASE)
+
+_DROP_BLOCKS = re.compile(r"<(script|style|noscript|svg|head|nav|footer|aside|form)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENTS = re.compile(r"<!--.*?-->", re.DOTALL)
+_PARAGRAPHS = re.compile(r"<p\b[^>]*>(.*?)</p\s*>", re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+_CHARSET = re.compile(rb"charset=[\"']?([A-Za-z0-9_-]+)", re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+def html_to_text(markup: str) -> str:
+    """Return readable text from an HTML page, preferring <p> content."""
+    markup = _COMMENTS.sub(" ", markup)
+    markup = _DROP_BLOCKS.sub(" ", markup)
+    paragraphs = _PARAGRAPHS.findall(markup)
+    body = " ".join(paragraphs) if paragraphs else markup
+    text = html.unescape(_TAGS.sub(" ", body))
+    return _SPACE.sub(" ", text).strip()[:MAX_TEXT_CHARS]
+
+
+def decode_body(raw: bytes, content_type: str) -> str:
+    match = _CHARSET.search(content_type.encode("latin-1", "ignore")) or _CHARSET.search(raw[:2048])
+    encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return raw.decode(encoding, "ignore")
+    except LookupError:
+        return raw.decode("utf-8", "ignore")
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(urldefrag(url.strip())[0].encode("utf-8")).hexdigest()
+
+
+def cache_path(url: str, suffix: str = ".txt") -> Path:
+    key = cache_key(url)
+    return CACHE_DIR / key[:2] / f"{key}{suffix}"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+def read_cache(url: str) -> Optional[str]:
+    path = cache_path(url)
+    if not path.exists():
+        return None
+    return path.read_text(encoding="utf-8")
+
+
+def write_cache(url: str, text: str) -> None:
+    _write_atomic(cache_path(url), text)
+
+
+def cached_miss(url: str) -> bool:
+    """True if an earlier fetch of ``url`` failed and its marker has not expired."""
+    try:
+        marker = json.loads(cache_path(url, ".miss").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    retry_after = marker.get("retry_after")
+    return retry_after is None or time.time() < retry_after
+
+
+def write_miss(url: str, reason: str, retry_s: Optional[float] = MISS_RETRY_S) -> None:
+    """Record a failed fetch; ``retry_s=None`` means never retry."""
+    retry_after = None if retry_s is None else time.time() + retry_s
+    _write_atomic(cache_path(url, ".miss"), json.dumps({"reason": reason, "retry_after": retry_after}))
+
+
+# ---------------------------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------------------------
+
+class Fetcher:
+    """Thread pool fetcher bounded globally and per host.
+
+    The bounds hold across concurrent ``fetch_many`` calls, so share one
+    instance between threads (e.g. backfill windows fetched ahead).
+    """
+
+    def __init__(self, global_limit: int = GLOBAL_LIMIT, per_host_limit: int = PER_HOST_LIMIT,
+                 max_bytes: int = MAX_BYTES, timeout: int = FETCH_TIMEOUT) -> None:
+        self.global_limit = global_limit
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._host_locks: Dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(per_host_limit)
+        )
+        self._global = threading.BoundedSemaphore(global_limit)
+        self._guard = threading.Lock()
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._guard:
+            return self._host_locks[host]
+
+    def fetch_text(self, url: str) -> Optional[str]:
+        cached = read_cache(url)
+        if cached is not None:
+            return cached
+        if cached_miss(url):
+            return None
+        request = Request(url, headers={"User-Agent": USER_AGENT, "Accept": "text/html,*/*;q=0.5"})
+        try:
+            # Host slot first, so a thread waiting on a busy host does not hold a global slot.
+            with self._host_semaphore(url), self._global:
+                with urlopen(request, timeout=self.timeout) as resp:
+                    content_type = resp.headers.get("Content-Type", "")
+                    if "html" not in content_type and "text" not in content_type:
+                        write_miss(url, f"content type {content_type!r}", retry_s=None)
+                        return None
+                    raw = resp.read(self.max_bytes)
+        except HTTPError as exc:
+            # Client errors are permanent; rate limits and server errors may clear up.
+            permanent = 400 <= exc.code < 500 and exc.code not in (408, 429)
+            write_miss(url, f"HTTP {exc.code}", retry_s=None if permanent else MISS_RETRY_S)
+            print(f"[warn] article fetch failed ({url}): {exc}", file=sys.stderr)
+            return None
+        except Exception as exc:
+            write_miss(url, str(exc))
+            print(f"[warn] article fetch failed ({url}): {exc}", file=sys.stderr)
+            return None
+        text = html_to_text(decode_body(raw, content_type))
+        write_cache(url, text)
+        return text
+
+    def fetch_many(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        by_key: Dict[str, str] = {}
+        for url in urls:
+            if url.startswith(("http://", "https://")):
+                by_key.setdefault(cache_key(url), url)
+        if not by_key:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.global_limit) as pool:
+            texts = dict(zip(by_key, pool.map(self.fetch_text, by_key.values())))
+        return {url: texts.get(cache_key(url)) for url in urls if url.startswith(("http://", "https://"))}
+
+
+def is_candidate(article: Dict[str, str]) -> bool:
+    return bool(DRONE_RE.search(f"{article.get('title', '')} {article.get('snippet') or ''}"))
+
+
+def enrich_articles(articles: List[Dict[str, str]], fetcher: Optional[Fetcher] = None) -> List[Dict[str, str]]:
+    """Attach extracted body text as article["text"] for drone-related candidates."""
+    fetcher = fetcher or Fetcher()
+    candidates = [a for a in articles if is_candidate(a) and a.get("url")]
+    texts = fetcher.fetch_many([a["url"] for a in candidates])
+    enriched = 0
+    for article in candidates:
+        text = texts.get(article["url"])
+        if text:
+            article["text"] = text
+            enriched += 1
+    print(f"[info] enriched {enriched}/{len(candidates)} candidate articles with body text")
+    return articles
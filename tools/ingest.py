@@ -1,32 +1,49 @@
 #!/usr/bin/env python3
 """Hourly ingestion for Drone Sightings (airports + harbours across Europe).
 
-Pulls open-source reports (GDELT + RSS), matches to known assets, applies
-simple scoring/deduplication, and writes public/incidents.json conforming to
-public/incidents.schema.json.
+Pulls open-source reports (GDELT + RSS), enriches drone-related candidates with
+article body text, matches to known assets, applies simple scoring/deduplication,
+and writes public/incidents.json conforming to public/incidents.schema.json plus
+a sequenced change feed under public/changes/.
 """
 from __future__ import annotations
 
+import argparse
+import copy
 import csv
+import dbm
+import hashlib
 import json
 import math
 import os
 import re
 import sys
+import threading
 import time
-from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from math import atan2, cos, radians, sin, sqrt
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlencode
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from urllib.request import urlopen
 
 import feedparser
 from rapidfuzz import fuzz
 
+from changefeed import changed_incidents, digests, publish_changes
+from enrich import Fetcher, enrich_articles
+from records import (
+    AssetRecord, EvidenceRecord, IncidentDetail, IncidentRecord, ScoresRecord, SourceRecord,
+    dump_document, incident_id, load_document,
+)
+from validate import IncidentValidator, validate_for_publish
+
 ROOT = Path(__file__).resolve().parents[1]
 ASSET_DIR = ROOT / "data" / "assets"
+CACHE_DIR = ROOT / "data" / "cache"
 PUBLIC_DIR = ROOT / "public"
 PUBLIC_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -53,6 +70,76 @@ def slug(value: str) -> str:
     return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
 
 
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ocid", "cmpid", "maca", "smid", "smtyp",
+    "taid", "ref", "referrer", "icid", "ito", "outputtype", "amp", "guccounter",
+}
+
+
+def canonical_url(url: str) -> str:
+    """Normalise a source URL so tracking, AMP and scheme variants compare equal."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    path = parts.path
+    # AMP caches wrap the publisher URL in the path:
+    #   https://www.google.com/amp/s/example.com/story
+    #   https://example-com.cdn.ampproject.org/c/s/example.com/story
+    amp = None
+    if host.endswith("google.com"):
+        amp = re.match(r"^/amp/(?:s/)?(.+)$", path)
+    elif host.endswith(".cdn.ampproject.org"):
+        amp = re.match(r"^/[cv]/(?:s/)?(.+)$", path)
+    if amp:
+        parts = urlsplit("https://" + amp.group(1) + (f"?{parts.query}" if parts.query else ""))
+        host, path = parts.netloc.lower(), parts.path
+    host = host.split("@")[-1]
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+    for prefix in ("www.", "amp.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = re.sub(r"/amp(\.html)?/?$", "/", path)
+    path = re.sub(r"\.amp(\.html)?$", "", path)
+    path = path.rstrip("/") or "/"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(("utm_", "at_")) and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def source_key(source: SourceRecord) -> str:
+    canonical = canonical_url(str(source.url or ""))
+    if not canonical:
+        # No URL: fall back to publisher + timestamp so such entries still dedupe.
+        canonical = f"{source.publisher or ''}|{source.first_seen or ''}"
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def merge_sources(
+    target: List[SourceRecord],
+    keys: Set[str],
+    sources: Iterable[SourceRecord],
+) -> int:
+    """Append sources whose canonical URL is not yet in ``keys``; returns how many were added."""
+    added = 0
+    for source in sources:
+        key = source_key(source)
+        if key in keys:
+            continue
+        keys.add(key)
+        target.append(source)
+        added += 1
+    return added
+
+
+def source_keys(sources: Iterable[SourceRecord]) -> Set[str]:
+    return {source_key(source) for source in sources}
+
+
 # ---------------------------------------------------------------------------
 # Load assets
 # ---------------------------------------------------------------------------
@@ -102,6 +189,17 @@ def load_harbours() -> List[Dict[str, object]]:
     return features
 
 
+def registry_fingerprint() -> str:
+    """Content hash of the asset registry snapshot used for cache invalidation."""
+    digest = hashlib.sha256()
+    for name in ("airports.csv", "harbours.geojson"):
+        path = ASSET_DIR / name
+        digest.update(name.encode("utf-8"))
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
 AIRPORTS = load_airports()
 HARBOURS = load_harbours()
 
@@ -110,7 +208,30 @@ HARBOURS = load_harbours()
 # Data sources
 # ---------------------------------------------------------------------------
 
-def fetch_gdelt(minutes: int = 90) -> List[Dict[str, str]]:
+GDELT_DATE_FORMAT = "%Y%m%d%H%M%S"
+GDELT_MIN_INTERVAL_S = 5.0  # GDELT's published limit: one request every 5 seconds
+
+_gdelt_lock = threading.Lock()
+_gdelt_last = 0.0
+
+
+def _wait_for_gdelt() -> None:
+    """Space GDELT requests from every thread (prefetch, window splits, retries) by the minimum interval."""
+    global _gdelt_last
+    with _gdelt_lock:
+        delay = _gdelt_last + GDELT_MIN_INTERVAL_S - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _gdelt_last = time.monotonic()
+
+
+def fetch_gdelt(
+    minutes: int = 90,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    maxrecords: int = 75,
+    strict: bool = False,
+) -> List[Dict[str, str]]:
     query = (
         "(drone OR uav) AND (airport OR airfield OR runway OR port OR harbour "
         "OR harbor OR ferry OR quay OR berth OR vts)"
@@ -118,14 +239,21 @@ def fetch_gdelt(minutes: int = 90) -> List[Dict[str, str]]:
     params = {
         "query": query,
         "format": "json",
-        "maxrecords": "75",
-        "timespan": f"MINUTE:{minutes}",
+        "maxrecords": str(maxrecords),
     }
+    if start and end:
+        params["startdatetime"] = start.strftime(GDELT_DATE_FORMAT)
+        params["enddatetime"] = end.strftime(GDELT_DATE_FORMAT)
+    else:
+        params["timespan"] = f"MINUTE:{minutes}"
     url = "https://api.gdeltproject.org/api/v2/doc/doc?" + urlencode(params)
     try:
+        _wait_for_gdelt()
         raw = urlopen(url, timeout=60).read().decode("utf-8", "ignore")
         data = json.loads(raw)
     except Exception as exc:
+        if strict:
+            raise
         print(f"[warn] GDELT fetch failed: {exc}", file=sys.stderr)
         return []
 
@@ -161,6 +289,7 @@ def fetch_rss() -> List[Dict[str, str]]:
                 "publisher": parsed.feed.get("title", "rss"),
                 "lang": entry.get("language"),
                 "datetime": entry.get("published"),
+                "snippet": entry.get("summary"),
             })
     return items
 
@@ -200,17 +329,197 @@ def fuzzy_match(name: str, candidates: List[Dict[str, object]], key: str = "name
     return best
 
 
-def resolve_asset(article: Dict[str, str], kind: str) -> Optional[Dict[str, object]]:
-    title = article.get("title", "")
-    if kind == "airport":
-        exact = match_iata(title)
-        if exact:
-            return exact
-        fuzzy = fuzzy_match(title, AIRPORTS, "name")
+# Whole words plus common inflections (Danish/Swedish definite forms, German genitive).
+ASSET_KEYWORDS = {
+    "airport": re.compile(
+        r"\b(airports?|airfields?|runways?|lufthavn(?:en|e)?|flughafens?|flygplats(?:en)?|lotnisk[aou]?"
+        r"|a[eé]roports?|aeropuertos?|aeroport[oi])\b",
+        re.IGNORECASE,
+    ),
+    "harbour": re.compile(
+        r"\b(ports?|harbou?rs?|ferry|ferries|quays?|berths?|havn(?:en|e)?|hamn(?:en)?|hafens?|haven)\b",
+        re.IGNORECASE,
+    ),
+}
+
+
+def keyword_sentences(text: str, kind: str, limit: int = 5) -> List[str]:
+    """Sentences of an article body that mention the asset kind, for matching."""
+    pattern = ASSET_KEYWORDS[kind]
+    hits = [s for s in re.split(r"(?<=[.!?])\s+", text) if pattern.search(s)]
+    return [s[:300] for s in hits[:limit]]
+
+
+def asset_type_from_text(text: str) -> Optional[str]:
+    """Asset kind named most often in an article body (airport wins ties)."""
+    counts = {kind: len(keyword_sentences(text, kind, limit=20)) for kind in ("airport", "harbour")}
+    if not any(counts.values()):
+        return None
+    return "airport" if counts["airport"] >= counts["harbour"] else "harbour"
+
+
+def resolve_from_text(text: str, kind: str) -> Optional[Dict[str, object]]:
+    candidates = AIRPORTS if kind == "airport" else HARBOURS if kind == "harbour" else None
+    if not candidates:
+        return None
+    for sentence in keyword_sentences(text, kind):
+        fuzzy = fuzzy_match(sentence, candidates, "name")
         if fuzzy:
             return fuzzy
-    elif kind == "harbour":
-        return fuzzy_match(title, HARBOURS, "name")
+    return None
+
+
+class ResolutionCache:
+    """Title -> asset memo with an in-memory LRU in front of an on-disk dbm.
+
+    Values are indices into AIRPORTS/HARBOURS (-1 for "no match"), so the
+    on-disk layer is only valid for the registry snapshot it was built from;
+    a fingerprint mismatch discards it.
+    """
+
+    FINGERPRINT_KEY = "__fingerprint__"
+    KEY_VERSION = 2  # bump when key() changes so stale on-disk entries are dropped
+
+    def __init__(self, path: Optional[Path], fingerprint: str, maxsize: int = 20000, readonly: bool = False) -> None:
+        fingerprint = f"{self.KEY_VERSION}:{fingerprint}"
+        self.maxsize = maxsize
+        self.memory: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.words: Dict[str, Set[str]] = {}
+        self.readonly = readonly
+        self.db = None
+        if path is None:
+            return
+        try:
+            if readonly:
+                # Backfill workers share the parent's store for lookups only.
+                self.db = dbm.open(str(path), "r")
+                if self.db.get(self.FINGERPRINT_KEY, b"").decode("ascii") != fingerprint:
+                    self.db.close()
+                    self.db = None
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = dbm.open(str(path), "c")
+            if self.db.get(self.FINGERPRINT_KEY, b"").decode("ascii") != fingerprint:
+                self.db.close()
+                self.db = dbm.open(str(path), "n")
+                self.db[self.FINGERPRINT_KEY] = fingerprint
+        except Exception as exc:
+            if not readonly:
+                print(f"[warn] resolution cache unavailable ({path}): {exc}", file=sys.stderr)
+            self.db = None
+
+    @staticmethod
+    def key(text: str, kind: str) -> str:
+        # Exactly what the matchers read: the uppercase tokens match_iata
+        # tries (in order) and the lowercased text fuzzy_match compares.
+        codes = ",".join(re.findall(r"\b[A-Z]{3}\b", text))
+        return f"{kind}|{codes}|{text.lower()}"
+
+    def name_words(self, kind: str, registry: List[Dict[str, object]]) -> Set[str]:
+        """Place-name words and IATA codes of ``registry``, built once per cache (i.e. per snapshot)."""
+        if kind not in self.words:
+            words: Set[str] = set()
+            for asset in registry:
+                for word in re.findall(r"\w{4,}", str(asset.get("name") or "").lower()):
+                    if not any(p.fullmatch(word) for p in ASSET_KEYWORDS.values()):
+                        words.add(word)
+                if asset.get("iata"):
+                    words.add(str(asset["iata"]))
+            self.words[kind] = words
+        return self.words[kind]
+
+    def get(self, key: str) -> Optional[int]:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.db is not None:
+            raw = self.db.get(key)
+            if raw is not None:
+                self.hits += 1
+                self._remember(key, int(raw))
+                return int(raw)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: int) -> None:
+        self._remember(key, value)
+        if self.db is not None and not self.readonly:
+            self.db[key] = str(value)
+
+    def _remember(self, key: str, value: int) -> None:
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def close(self) -> None:
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+RESOLUTION_CACHE: Optional[ResolutionCache] = None
+
+
+def resolution_cache() -> ResolutionCache:
+    """Open the shared resolution cache on first use (not at import, so forked workers don't inherit it)."""
+    global RESOLUTION_CACHE
+    if RESOLUTION_CACHE is None:
+        RESOLUTION_CACHE = ResolutionCache(CACHE_DIR / "resolve", registry_fingerprint())
+    return RESOLUTION_CACHE
+
+
+def strip_publisher_suffix(title: str, name_words: Set[str]) -> str:
+    """Drop a trailing " - Publisher" / " | Publisher" unless it names an asset.
+
+    A suffix is kept when it has an asset keyword, a known IATA code or a
+    place-name word from ``name_words`` ("... - Hirtshals").
+    """
+    match = re.search(r"\s+[-|–—]\s+([^-|–—]{1,40})$", title)
+    if not match:
+        return title
+    suffix = match.group(1)
+    if any(p.search(suffix) for p in ASSET_KEYWORDS.values()):
+        return title
+    tokens = set(re.findall(r"\b[A-Z]{3}\b", suffix)) | set(re.findall(r"\w{4,}", suffix.lower()))
+    if tokens & name_words:
+        return title
+    return title[:match.start()]
+
+
+def resolve_title(title: str, kind: str) -> Optional[Dict[str, object]]:
+    registry = AIRPORTS if kind == "airport" else HARBOURS if kind == "harbour" else None
+    if registry is None:
+        return None
+    cache = resolution_cache()
+    # Match on the same text the key is built from, so syndicated copies
+    # ("... - BBC", "... - Reuters") share an entry and a hit always equals
+    # a fresh lookup.
+    text = strip_publisher_suffix(title, cache.name_words(kind, registry))
+    key = cache.key(text, kind)
+    index = cache.get(key)
+    if index is not None:
+        return registry[index] if 0 <= index < len(registry) else None
+
+    asset = None
+    if kind == "airport":
+        asset = match_iata(text) or fuzzy_match(text, AIRPORTS, "name")
+    else:
+        asset = fuzzy_match(text, HARBOURS, "name")
+    cache.put(key, registry.index(asset) if asset else -1)
+    return asset
+
+
+def resolve_asset(article: Dict[str, str], kind: str) -> Optional[Dict[str, object]]:
+    asset = resolve_title(article.get("title", ""), kind)
+    if asset:
+        return asset
+    text = article.get("text")
+    if text:
+        return resolve_from_text(text, kind)
     return None
 
 
@@ -218,10 +527,10 @@ def resolve_asset(article: Dict[str, str], kind: str) -> Optional[Dict[str, obje
 # Scoring
 # ---------------------------------------------------------------------------
 
-def evidence_strength(sources: List[Dict[str, str]]) -> int:
+def evidence_strength(sources: List[SourceRecord]) -> int:
     if not sources:
         return 0
-    pubs = " ".join((src.get("publisher", "") or "").lower() for src in sources)
+    pubs = " ".join((src.publisher or "").lower() for src in sources)
     tier_one = ["reuters", "associated press", "ap", "afp", "ansa", "bbc", "dr", "nrk", "lsm", "pap", "nyt"]
     if any(pub in pubs for pub in tier_one):
         return 2
@@ -240,138 +549,474 @@ def severity_score(asset_type: str, category: str, duration_min: Optional[int])
 # Processing
 # ---------------------------------------------------------------------------
 
-def build_incident(article: Dict[str, str]) -> Optional[Dict[str, object]]:
-    asset_type = detect_asset_type(article["title"], article["title"])
+def parse_seen(value: Optional[str]) -> Optional[datetime]:
+    """Parse a GDELT seendate (20250925T194500Z), ISO or RSS (RFC 822) timestamp."""
+    if not value:
+        return None
+    for fmt in ("%Y%m%dT%H%M%SZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def build_incident(article: Dict[str, str], use_article_time: bool = False) -> Optional[IncidentRecord]:
+    asset_type = detect_asset_type(article["title"], "")
+    if not asset_type:
+        # Only when the headline gives no type: generic words like "flight"
+        # appear in almost every body, so only asset-naming sentences count.
+        asset_type = asset_type_from_text(article.get("text") or article.get("snippet") or "")
     if not asset_type:
         return None
     asset = resolve_asset(article, asset_type)
     if not asset:
         return None
 
-    sources = [{
-        "url": article.get("url", ""),
-        "publisher": article.get("publisher", ""),
-        "lang": article.get("lang"),
-        "first_seen": article.get("datetime"),
-    }]
+    published = parse_seen(article.get("datetime"))
+    sources = [SourceRecord(
+        url=article.get("url", ""),
+        publisher=article.get("publisher", ""),
+        lang=article.get("lang"),
+        first_seen=published.strftime("%Y-%m-%dT%H:%M:%SZ") if published else None,
+    )]
     strength = evidence_strength(sources)
     severity = severity_score(asset_type, "sighting", None)
 
-    uid = f"{asset_type}-{slug(str(asset.get('name', 'unknown')))}-{int(time.time())}"
-
-    return {
-        "id": uid,
-        "first_seen_utc": utcnow_iso(),
-        "last_update_utc": utcnow_iso(),
-        "asset": {
-            "type": asset_type,
-            "name": asset.get("name"),
-            "iata": asset.get("iata"),
-            "icao": asset.get("icao"),
-            "osm_id": asset.get("osm_id"),
-            "lat": asset.get("lat"),
-            "lon": asset.get("lon"),
-        },
-        "incident": {
-            "category": "sighting",
-            "status": "unconfirmed",
-            "duration_min": None,
-            "uav_count": None,
-            "uav_characteristics": None,
-            "response": [],
-            "narrative": article.get("title"),
-        },
-        "evidence": {
-            "strength": strength,
-            "attribution": "none",
-            "sources": sources,
-            "notam_navtex_ids": [],
-        },
-        "scores": {
-            "severity": severity,
-            "risk_radius_m": 1000,
-        },
-        "tags": [],
-    }
+    seen = published if use_article_time else None
+    stamp = seen.strftime("%Y-%m-%dT%H:%M:%SZ") if seen else utcnow_iso()
+    # The source hash keeps ids unique when two stories about one asset land in the same second.
+    uid = (f"{asset_type}-{slug(str(asset.get('name', 'unknown')))}-{int(seen.timestamp() if seen else time.time())}"
+           f"-{source_key(sources[0])[:8]}")
 
+    return IncidentRecord(
+        id=uid,
+        first_seen_utc=stamp,
+        last_update_utc=stamp,
+        asset=AssetRecord(
+            type=asset_type,
+            name=asset.get("name"),
+            iata=asset.get("iata"),
+            icao=asset.get("icao"),
+            osm_id=asset.get("osm_id"),
+            lat=asset.get("lat"),
+            lon=asset.get("lon"),
+        ),
+        incident=IncidentDetail(
+            category="sighting",
+            status="unconfirmed",
+            duration_min=None,
+            uav_count=None,
+            uav_characteristics=None,
+            response=[],
+            narrative=article.get("title"),
+        ),
+        evidence=EvidenceRecord(
+            strength=strength,
+            attribution="none",
+            sources=sources,
+            notam_navtex_ids=[],
+        ),
+        scores=ScoresRecord(severity=severity, risk_radius_m=1000),
+        tags=[],
+    )
 
-def dedupe_incidents(incidents: List[Dict[str, object]]) -> List[Dict[str, object]]:
-    results: List[Dict[str, object]] = []
-    seen: Dict[Tuple[str, str], Dict[str, object]] = {}
-    for incident in incidents:
-        key = (incident["asset"]["type"], incident["asset"]["name"])
-        existing = seen.get(key)
+
+def absorb(current: IncidentRecord, incident: IncidentRecord, keys: Dict[int, Set[str]]) -> None:
+    """Fold a duplicate ``incident`` into ``current`` (timestamps, strength, sources).
+
+    Nothing changes unless a new source is added, so re-reading the same story
+    (overlapping GDELT windows) leaves the record untouched.
+    """
+    sources = current.evidence.sources
+    if id(current) not in keys:
+        keys[id(current)] = source_keys(sources)
+    if not merge_sources(sources, keys[id(current)], incident.evidence.sources):
+        return
+    current.last_update_utc = max(current.last_update_utc or "", incident.last_update_utc)
+    current.evidence.strength = max(current.evidence.strength, incident.evidence.strength)
+
+
+def similar(a: IncidentRecord, b: IncidentRecord) -> bool:
+    similarity = fuzz.partial_ratio(
+        (a.incident.narrative or "").lower(),
+        (b.incident.narrative or "").lower(),
+    )
+    return similarity >= 70
+
+
+class IncidentDeduper:
+    """Incremental form of dedupe_incidents so results can be fed in as they arrive."""
+
+    def __init__(self) -> None:
+        self.results: List[IncidentRecord] = []
+        self.seen: Dict[Tuple[str, str], IncidentRecord] = {}
+        self.keys: Dict[int, Set[str]] = {}
+
+    def add(self, incident: IncidentRecord) -> None:
+        key = (incident.asset.type, incident.asset.name)
+        existing = self.seen.get(key)
         if not existing:
-            seen[key] = incident
-            results.append(incident)
-            continue
-        similarity = fuzz.partial_ratio(
-            (incident["incident"]["narrative"] or "").lower(),
-            (existing["incident"]["narrative"] or "").lower(),
-        )
-        if similarity >= 70:
-            existing["last_update_utc"] = incident["last_update_utc"]
-            existing["evidence"]["strength"] = max(existing["evidence"]["strength"], incident["evidence"]["strength"])
-            existing["evidence"]["sources"].extend(incident["evidence"]["sources"])
+            self.seen[key] = incident
+            self.results.append(incident)
+        elif similar(incident, existing):
+            absorb(existing, incident, self.keys)
         else:
-            results.append(incident)
-    return results
+            self.results.append(incident)
 
 
-def merge_with_existing(new_incidents: List[Dict[str, object]]) -> List[Dict[str, object]]:
+def dedupe_incidents(incidents: Iterable[IncidentRecord]) -> List[IncidentRecord]:
+    deduper = IncidentDeduper()
+    for incident in incidents:
+        deduper.add(incident)
+    return deduper.results
+
+
+def load_existing() -> List[IncidentRecord]:
     path = PUBLIC_DIR / "incidents.json"
     if not path.exists():
-        return new_incidents
+        return []
     try:
-        existing_doc = json.loads(path.read_text(encoding="utf-8"))
+        _, incidents = load_document(path.read_text(encoding="utf-8"))
     except Exception as exc:
         print(f"[warn] failed to parse existing incidents.json: {exc}", file=sys.stderr)
-        return new_incidents
+        return []
+    return incidents
+
+
+def ensure_unique_ids(incidents: List[IncidentRecord]) -> int:
+    """Re-id every repeat of an id already used earlier in the list; returns how many were renamed.
+
+    The change feed, validation rollback and downstream consumers all key on
+    ids, so the first holder of an id keeps it and later ones get a suffix
+    from their first source.
+    """
+    taken = {incident.id for incident in incidents}
+    seen: Set[str] = set()
+    renamed = 0
+    for incident in incidents:
+        if incident.id in seen:
+            sources = incident.evidence.sources
+            suffix = source_key(sources[0])[:8] if sources else "dup"
+            candidate, n = f"{incident.id}-{suffix}", 2
+            while candidate in taken:
+                candidate, n = f"{incident.id}-{suffix}-{n}", n + 1
+            print(f"[warn] duplicate incident id {incident.id}; renamed to {candidate}", file=sys.stderr)
+            incident.id = candidate
+            taken.add(candidate)
+            renamed += 1
+        seen.add(incident.id)
+    return renamed
 
-    existing = existing_doc.get("incidents", [])
+
+def merge_with_existing(
+    new_incidents: List[IncidentRecord],
+    existing: Optional[List[IncidentRecord]] = None,
+    previous: Optional[Dict[str, IncidentRecord]] = None,
+) -> List[IncidentRecord]:
+    """Fold new incidents into the history.
+
+    If ``previous`` is given, it receives a copy of every existing incident
+    taken just before it is first updated, so an invalid update can be rolled back.
+    """
+    if existing is None:
+        existing = load_existing()
+    # Heal histories published before ids were unique; the renamed copies show
+    # up as upserts, so consumers that collapsed them get both back.
+    ensure_unique_ids(existing)
     combined = existing[:]
+    published = {id(current) for current in existing}
+    by_asset: Dict[Tuple[str, str], List[IncidentRecord]] = defaultdict(list)
+    for current in combined:
+        by_asset[(current.asset.type, current.asset.name)].append(current)
+    keys: Dict[int, Set[str]] = {}
     for incident in new_incidents:
-        matched = False
-        for current in combined:
-            if current["asset"]["type"] != incident["asset"]["type"]:
-                continue
-            if current["asset"]["name"] != incident["asset"]["name"]:
-                continue
-            similarity = fuzz.partial_ratio(
-                (current["incident"]["narrative"] or "").lower(),
-                (incident["incident"]["narrative"] or "").lower(),
-            )
-            if similarity >= 70:
-                current["last_update_utc"] = incident["last_update_utc"]
-                current["evidence"]["strength"] = max(current["evidence"]["strength"], incident["evidence"]["strength"])
-                current["evidence"]["sources"].extend(incident["evidence"]["sources"])
-                matched = True
+        bucket = by_asset[(incident.asset.type, incident.asset.name)]
+        for current in bucket:
+            if similar(current, incident):
+                if previous is not None and id(current) in published:
+                    previous.setdefault(incident_id(current), copy.deepcopy(current))
+                absorb(current, incident, keys)
                 break
-        if not matched:
+        else:
             combined.append(incident)
+            bucket.append(incident)
+    ensure_unique_ids(combined)
     return combined
 
 
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+BACKFILL_STATE = CACHE_DIR / "backfill_state.json"
+BACKFILL_MAXRECORDS = 250  # GDELT's per-request cap
+MIN_SPLIT = timedelta(minutes=15)
+
+
+def _init_backfill_worker() -> None:
+    """Per-process setup: the registry is loaded once at import; open the cache read-only."""
+    global RESOLUTION_CACHE
+    RESOLUTION_CACHE = ResolutionCache(CACHE_DIR / "resolve", registry_fingerprint(), readonly=True)
+
+
+def _classify_chunk(articles: List[Dict[str, str]]) -> List[IncidentRecord]:
+    incidents = []
+    for article in articles:
+        incident = build_incident(article, use_article_time=True)
+        if incident:
+            incidents.append(incident)
+    return incidents
+
+
+def backfill_windows(start: datetime, end: datetime, hours: int) -> List[Tuple[datetime, datetime]]:
+    windows = []
+    cursor = start
+    step = timedelta(hours=hours)
+    while cursor < end:
+        windows.append((cursor, min(cursor + step, end)))
+        cursor += step
+    return windows
+
+
+def load_backfill_state(start: datetime, hours: int) -> Optional[Tuple[datetime, datetime]]:
+    """(resolved end, done_until) of an earlier run with the same start and window size."""
+    if not BACKFILL_STATE.exists():
+        return None
+    state = json.loads(BACKFILL_STATE.read_text(encoding="utf-8"))
+    if (state.get("from"), state.get("window_hours")) != (start.strftime(GDELT_DATE_FORMAT), hours):
+        return None
+    parse = lambda value: datetime.strptime(value, GDELT_DATE_FORMAT).replace(tzinfo=timezone.utc)
+    return parse(state["to"]), parse(state["done_until"])
+
+
+def save_backfill_state(start: datetime, end: datetime, hours: int, done_until: datetime) -> None:
+    BACKFILL_STATE.parent.mkdir(parents=True, exist_ok=True)
+    BACKFILL_STATE.write_text(json.dumps({
+        "from": start.strftime(GDELT_DATE_FORMAT),
+        "to": end.strftime(GDELT_DATE_FORMAT),
+        "window_hours": hours,
+        "done_until": done_until.strftime(GDELT_DATE_FORMAT),
+    }), encoding="utf-8")
+
+
+def fetch_backfill_window(start: datetime, end: datetime, retries: int = 4) -> List[Dict[str, str]]:
+    """GDELT fetch that retries instead of returning [], so a failed window is never checkpointed."""
+    for attempt in range(retries + 1):
+        try:
+            return fetch_gdelt(start=start, end=end, maxrecords=BACKFILL_MAXRECORDS, strict=True)
+        except Exception as exc:
+            if attempt == retries:
+                raise
+            delay = 10 * (2 ** attempt)
+            print(f"[warn] GDELT window {start:%Y-%m-%d %H:%M} failed ({exc}); retrying in {delay}s", file=sys.stderr)
+            time.sleep(delay)
+    return []
+
+
+def fetch_backfill_articles(start: datetime, end: datetime) -> List[Dict[str, str]]:
+    """Fetch one window, halving it while GDELT returns a full (possibly truncated) page."""
+    articles = fetch_backfill_window(start, end)
+    if len(articles) < BACKFILL_MAXRECORDS:
+        return articles
+    if end - start <= MIN_SPLIT:
+        print(f"[warn] GDELT window {start:%Y-%m-%d %H:%M} -> {end:%H:%M} hit {BACKFILL_MAXRECORDS} records; "
+              "results may be truncated", file=sys.stderr)
+        return articles
+    middle = start + (end - start) / 2
+    return fetch_backfill_articles(start, middle) + fetch_backfill_articles(middle, end)
+
+
+def _prepare_window(start: datetime, end: datetime, pages: Optional[Fetcher]) -> List[Dict[str, str]]:
+    articles = fetch_backfill_articles(start, end)
+    if pages is not None:
+        enrich_articles(articles, pages)
+    return articles
+
+
+def backfill(
+    start: datetime,
+    end: Optional[datetime] = None,
+    window_hours: int = 6,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    enrich: bool = False,
+    lookahead: Optional[int] = None,
+) -> None:
+    """Rebuild past incidents from GDELT history, one checkpointed window at a time.
+
+    Up to ``lookahead`` windows are fetched ahead in threads, and their chunks
+    are queued on the process pool as soon as they arrive, so classification
+    of later windows overlaps fetching and merging of earlier ones. Windows
+    are still merged into public/incidents.json and checkpointed strictly in
+    order, and chunk results are consumed in submission order so
+    de-duplication does not depend on which worker finishes first.
+    """
+    state = load_backfill_state(start, window_hours)
+    done_until = None
+    # Without an explicit end, a rerun resumes towards the end the first run resolved.
+    if state and (end is None or state[0] == end):
+        end, done_until = state
+    elif end is None:
+        end = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    windows = backfill_windows(start, end, window_hours)
+    if done_until:
+        windows = [w for w in windows if w[1] > done_until]
+        print(f"[info] resuming backfill from {done_until.isoformat()} ({len(windows)} windows left)")
+
+    # Reset the on-disk cache if the registry changed, then close it so workers
+    # can open it read-only.
+    resolution_cache().close()
+    combined = load_existing()
+    before = digests(combined)
+    validator = IncidentValidator()
+    total_articles = 0
+    workers = workers or os.cpu_count() or 1
+    # One window yields at most a few chunks, so keep several windows in flight.
+    lookahead = lookahead or max(4, workers)
+    # One page fetcher for all windows in flight, so its global and per-host limits hold overall.
+    pages = Fetcher() if enrich else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_backfill_worker) as pool, \
+            ThreadPoolExecutor(max_workers=min(lookahead, 4)) as fetcher:
+        # Start every worker before the first fetch thread exists: with the fork
+        # start method the pool forks all workers on its first submit, and forking
+        # while other threads hold locks (TLS, logging, the GDELT throttle) can
+        # deadlock the children.
+        pool.submit(int).result()
+        fetches: deque = deque()
+        queued = iter(windows)
+        classifying: deque = deque()
+
+        def top_up() -> None:
+            while len(fetches) + len(classifying) < lookahead:
+                window = next(queued, None)
+                if window is None:
+                    return
+                fetches.append((window, fetcher.submit(_prepare_window, window[0], window[1], pages)))
+
+        top_up()
+        while fetches or classifying:
+            # Hand every window whose articles have arrived to the pool before merging.
+            while fetches and (fetches[0][1].done() or not classifying):
+                window, fetched = fetches.popleft()
+                articles = fetched.result()
+                chunks = [articles[i:i + chunk_size] for i in range(0, len(articles), chunk_size)]
+                classifying.append((window, len(articles), [pool.submit(_classify_chunk, c) for c in chunks]))
+                top_up()
+            (window_start, window_end), article_count, futures = classifying.popleft()
+            top_up()
+            total_articles += article_count
+            deduper = IncidentDeduper()
+            for future in futures:
+                for incident in future.result():
+                    deduper.add(incident)
+            previous: Dict[str, IncidentRecord] = {}
+            combined = merge_with_existing(deduper.results, combined, previous)
+            changed = {incident_id(inc) for inc in changed_incidents(combined, before)}
+            combined = validate_for_publish(combined, changed, validator, previous)
+            generated = utcnow_iso()
+            write_payload(combined, generated)
+            publish_changes(combined, before, generated)
+            before = digests(combined)
+            save_backfill_state(start, end, window_hours, window_end)
+            print(f"[info] backfill {window_start:%Y-%m-%d %H:%M} -> {window_end:%Y-%m-%d %H:%M}: "
+                  f"{article_count} articles, {len(deduper.results)} incidents, {len(combined)} total")
+    print(f"[info] backfill complete: {total_articles} articles across {len(windows)} windows")
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+def write_payload(incidents: List[IncidentRecord], generated_utc: Optional[str] = None) -> Path:
+    out_path = PUBLIC_DIR / "incidents.json"
+    out_path.write_text(dump_document(generated_utc or utcnow_iso(), incidents), encoding="utf-8")
+    return out_path
+
+
+def compact_sources() -> None:
+    """One-off cleanup: collapse duplicate sources in the existing history."""
+    path = PUBLIC_DIR / "incidents.json"
+    if not path.exists():
+        print(f"[warn] {path} not found; nothing to compact", file=sys.stderr)
+        return
+    generated, incidents = load_document(path.read_text(encoding="utf-8"))
+    before = after = 0
+    for incident in incidents:
+        evidence = incident.evidence
+        if not isinstance(evidence, EvidenceRecord) or not evidence.sources:
+            continue
+        compacted: List[SourceRecord] = []
+        merge_sources(compacted, set(), evidence.sources)
+        before += len(evidence.sources)
+        after += len(compacted)
+        evidence.sources = compacted
+    out_path = write_payload(incidents, generated)
+    print(f"[info] compacted {out_path}: {before} -> {after} sources across {len(incidents)} incidents")
+
+
+def parse_utc(value: str) -> datetime:
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Hourly Drone Sightings ingestion.")
+    parser.add_argument("--compact-sources", action="store_true",
+                        help="De-duplicate evidence sources in public/incidents.json by canonical URL and exit.")
+    parser.add_argument("--backfill-from", type=parse_utc,
+                        help="Backfill GDELT history starting at this UTC date/time (e.g. 2025-09-01).")
+    parser.add_argument("--backfill-to", type=parse_utc,
+                        help="End of the backfill range (default: now, or the end of the run being resumed).")
+    parser.add_argument("--window-hours", type=int, default=6, help="Backfill window size in hours.")
+    parser.add_argument("--workers", type=int, help="Backfill worker processes (default: CPU count).")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Articles per backfill task.")
+    parser.add_argument("--enrich", action="store_true", help="Fetch article bodies during backfill.")
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
+    if args.compact_sources:
+        compact_sources()
+        return
+    if args.backfill_from:
+        backfill(args.backfill_from, args.backfill_to, window_hours=args.window_hours, workers=args.workers,
+                 chunk_size=args.chunk_size, enrich=args.enrich)
+        return
+
     candidates = fetch_gdelt(90) + fetch_rss()
     print(f"[info] fetched {len(candidates)} candidate reports")
-    incidents: List[Dict[str, object]] = []
+    enrich_articles(candidates)
+    incidents: List[IncidentRecord] = []
     for article in candidates:
         incident = build_incident(article)
         if incident:
             incidents.append(incident)
+    cache = resolution_cache()
+    cache.close()
+    print(f"[info] title resolution cache: {cache.hits} hits, {cache.misses} misses")
     incidents = dedupe_incidents(incidents)
-    merged = merge_with_existing(incidents)
-    payload = {
-        "generated_utc": utcnow_iso(),
-        "incidents": merged,
-    }
-    out_path = PUBLIC_DIR / "incidents.json"
-    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    existing = load_existing()
+    before = digests(existing)
+    previous: Dict[str, IncidentRecord] = {}
+    merged = merge_with_existing(incidents, existing, previous)
+    changed = {incident_id(inc) for inc in changed_incidents(merged, before)}
+    merged = validate_for_publish(merged, changed, previous=previous)
+    generated = utcnow_iso()
+    out_path = write_payload(merged, generated)
+    publish_changes(merged, before, generated)
     print(f"[info] wrote {out_path} ({len(merged)} incidents)")
 
 
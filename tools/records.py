@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Typed, slotted incident records for the ingest pipeline.
+
+Each record mirrors one object in public/incidents.schema.json. Loading is
+lossless: fields absent from the input stay ``MISSING`` (and are not written
+back), and keys the schema does not know about are kept in ``extra``. Strings
+that repeat across a large history (asset names, publishers, enum values) are
+interned on load.
+
+``dump_document`` is the fast writer. ``json.dumps(..., indent=2)`` falls back
+to the pure-Python encoder; here every incident is encoded by the C encoder on
+a line of its own, which keeps git diffs per incident.
+
+Run ``python tools/records.py --bench 100000`` to compare against plain dicts.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+_DEFAULTS = (MISSING,) * 16
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _intern(value: object) -> object:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _split(raw: Dict[str, object], known: tuple, known_set: frozenset) -> tuple:
+    values = tuple(map(raw.get, known, _DEFAULTS))
+    # The common case has no unknown keys; the subset test runs in C.
+    extra = None if raw.keys() <= known_set else {k: v for k, v in raw.items() if k not in known_set}
+    return values, extra
+
+
+def _pack(names: tuple, values: tuple, extra: Optional[Dict[str, object]]) -> Dict[str, object]:
+    out = {name: value for name, value in zip(names, values) if value is not MISSING}
+    if extra:
+        out.update(extra)
+    return out
+
+
+@dataclass(slots=True)
+class SourceRecord:
+    url: object = MISSING
+    publisher: object = MISSING
+    lang: object = MISSING
+    first_seen: object = MISSING
+    extra: Optional[Dict[str, object]] = None
+
+    FIELDS = ("url", "publisher", "lang", "first_seen")
+    FIELD_SET = frozenset(FIELDS)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, object]) -> "SourceRecord":
+        (url, publisher, lang, first_seen), extra = _split(raw, cls.FIELDS, cls.FIELD_SET)
+        return cls(url, _intern(publisher), _intern(lang), first_seen, extra)
+
+    def to_dict(self) -> Dict[str, object]:
+        return _pack(self.FIELDS, (self.url, self.publisher, self.lang, self.first_seen), self.extra)
+
+
+@dataclass(slots=True)
+class AssetRecord:
+    type: object = MISSING
+    name: object = MISSING
+    iata: object = MISSING
+    icao: object = MISSING
+    osm_id: object = MISSING
+    lat: object = MISSING
+    lon: object = MISSING
+    extra: Optional[Dict[str, object]] = None
+
+    FIELDS = ("type", "name", "iata", "icao", "osm_id", "lat", "lon")
+    FIELD_SET = frozenset(FIELDS)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, object]) -> "AssetRecord":
+        values, extra = _split(raw, cls.FIELDS, cls.FIELD_SET)
+        kind, name, iata, icao, osm_id, lat, lon = values
+        return cls(_intern(kind), _intern(name), _intern(iata), _intern(icao), osm_id, lat, lon, extra)
+
+    def to_dict(self) -> Dict[str, object]:
+        return _pack(self.FIELDS, (self.type, self.name, self.iata, self.icao, self.osm_id, self.lat, self.lon),
+                     self.extra)
+
+
+@dataclass(slots=True)
+class IncidentDetail:
+    category: object = MISSING
+    status: object = MISSING
+    duration_min: object = MISSING
+    uav_count: object = MISSING
+    uav_characteristics: object = MISSING
+    response: object = MISSING
+    narrative: object = MISSING
+    extra: Optional[Dict[str, object]] = None
+
+    FIELDS = ("category", "status", "duration_min", "uav_count", "uav_characteristics", "response", "narrative")
+    FIELD_SET = frozenset(FIELDS)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, object]) -> "IncidentDetail":
+        (category, status, duration, count, chars, response, narrative), extra = _split(raw, cls.FIELDS, cls.FIELD_SET)
+        return cls(_intern(category), _intern(status), duration, count, chars, response, narrative, extra)
+
+    def to_dict(self) -> Dict[str, object]:
+        return _pack(self.FIELDS, (self.category, self.status, self.duration_min, self.uav_count,
+                                   self.uav_characteristics, self.response, self.narrative), self.extra)
+
+
+@dataclass(slots=True)
+class EvidenceRecord:
+    strength: object = MISSING
+    attribution: object = MISSING
+    sources: List[SourceRecord] = field(default_factory=list)
+    notam_navtex_ids: object = MISSING
+    extra: Optional[Dict[str, object]] = None
+    has_sources: bool = True
+
+    FIELDS = ("strength", "attribution", "sources", "notam_navtex_ids")
+    FIELD_SET = frozenset(FIELDS)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, object]) -> "EvidenceRecord":
+        (strength, attribution, sources, notam), extra = _split(raw, cls.FIELDS, cls.FIELD_SET)
+        has_sources = isinstance(sources, list)
+        if sources is not MISSING and not has_sources:
+            # Not a list: keep it verbatim rather than guessing.
+            extra = {**(extra or {}), "sources": sources}
+        parsed = [SourceRecord.from_dict(s) if isinstance(s, dict) else s for s in sources] if has_sources else []
+        return cls(strength, _intern(attribution), parsed, notam, extra, has_sources)
+
+    def to_dict(self) -> Dict[str, object]:
+        sources = [s.to_dict() if isinstance(s, SourceRecord) else s for s in self.sources] \
+            if self.has_sources else MISSING
+        return _pack(self.FIELDS, (self.strength, self.attribution, sources, self.notam_navtex_ids), self.extra)
+
+
+@dataclass(slots=True)
+class ScoresRecord:
+    severity: object = MISSING
+    risk_radius_m: object = MISSING
+    extra: Optional[Dict[str, object]] = None
+
+    FIELDS = ("severity", "risk_radius_m")
+    FIELD_SET = frozenset(FIELDS)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, object]) -> "ScoresRecord":
+        (severity, radius), extra = _split(raw, cls.FIELDS, cls.FIELD_SET)
+        return cls(severity, radius, extra)
+
+    def to_dict(self) -> Dict[str, object]:
+        return _pack(self.FIELDS, (self.severity, self.risk_radius_m), self.extra)
+
+
+_RECORD_TYPES = (AssetRecord, IncidentDetail, EvidenceRecord, ScoresRecord)
+
+
+@dataclass(slots=True)
+class IncidentRecord:
+    id: object = MISSING
+    first_seen_utc: object = MISSING
+    last_update_utc: object = MISSING
+    asset: object = MISSING
+    incident: object = MISSING
+    evidence: object = MISSING
+    scores: object = MISSING
+    tags: object = MISSING
+    extra: Optional[Dict[str, object]] = None
+
+    FIELDS = ("id", "first_seen_utc", "last_update_utc", "asset", "incident", "evidence", "scores", "tags")
+    FIELD_SET = frozenset(FIELDS)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, object]) -> "IncidentRecord":
+        (uid, first_seen, last_update, asset, detail, evidence, scores, tags), extra = \
+            _split(raw, cls.FIELDS, cls.FIELD_SET)
+        return cls(
+            uid, first_seen, last_update,
+            AssetRecord.from_dict(asset) if isinstance(asset, dict) else asset,
+            IncidentDetail.from_dict(detail) if isinstance(detail, dict) else detail,
+            EvidenceRecord.from_dict(evidence) if isinstance(evidence, dict) else evidence,
+            ScoresRecord.from_dict(scores) if isinstance(scores, dict) else scores,
+            tags, extra,
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        asset, detail, evidence, scores = (
+            value.to_dict() if isinstance(value, _RECORD_TYPES) else value
+            for value in (self.asset, self.incident, self.evidence, self.scores)
+        )
+        return _pack(self.FIELDS, (self.id, self.first_seen_utc, self.last_update_utc, asset, detail,
+                                   evidence, scores, self.tags), self.extra)
+
+    def to_json(self) -> str:
+        return _encode(self.to_dict())
+
+
+def as_dict(incident: object) -> Dict[str, object]:
+    """Plain-dict view of an IncidentRecord (dicts pass through unchanged)."""
+    return incident.to_dict() if isinstance(incident, IncidentRecord) else incident
+
+
+def incident_id(incident: object) -> str:
+    return str(incident.id if isinstance(incident, IncidentRecord) else incident.get("id"))
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+
+def load_document(text: str) -> tuple:
+    """Parse an incidents.json document into (generated_utc, [IncidentRecord])."""
+    # Nothing here creates reference cycles; pausing the cyclic GC avoids
+    # repeated full scans while hundreds of thousands of objects are allocated.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        doc = json.loads(text)
+        incidents = [IncidentRecord.from_dict(raw) for raw in doc.get("incidents", [])]
+    finally:
+        if enabled:
+            gc.enable()
+    return doc.get("generated_utc"), incidents
+
+
+def dump_document(generated_utc: str, incidents: List[IncidentRecord]) -> str:
+    """Serialise with the C encoder, one incident per line."""
+    if not incidents:
+        return '{\n  "generated_utc": ' + _encode(generated_utc) + ',\n  "incidents": []\n}\n'
+    body = ",\n    ".join(inc.to_json() for inc in incidents)
+    return '{\n  "generated_utc": ' + _encode(generated_utc) + ',\n  "incidents": [\n    ' + body + "\n  ]\n}\n"
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def _bench(count: int, sample_path: str) -> None:
+    import copy
+    import time
+    import tracemalloc
+
+    with open(sample_path, encoding="utf-8") as fh:
+        sample = json.load(fh)["incidents"]
+    history = []
+    for i in range(count):
+        inc = copy.deepcopy(sample[i % len(sample)])
+        inc["id"] = f"{inc['id']}-{i}"
+        history.append(inc)
+    text = json.dumps({"generated_utc": "2025-01-01T00:00:00Z", "incidents": history}, ensure_ascii=False)
+    del history
+    print(f"history: {count} incidents, {len(text) / 1e6:.1f} MB JSON")
+
+    def measure(label: str, fn):
+        # Time without tracing, then measure retained memory in a second pass.
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        tracemalloc.start()
+        result = fn()
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"  {label:<28} {elapsed:6.2f} s  {current / 1e6:8.1f} MB retained")
+        return result
+
+    dicts = measure("load (dicts)", lambda: json.loads(text)["incidents"])
+    _, records = measure("load (records)", lambda: load_document(text))
+
+    started = time.perf_counter()
+    json.dumps({"generated_utc": "x", "incidents": dicts}, ensure_ascii=False, indent=2)
+    print(f"  {'dump (dicts, indent=2)':<28} {time.perf_counter() - started:6.2f} s")
+    started = time.perf_counter()
+    out = dump_document("x", records)
+    print(f"  {'dump (records, fast path)':<28} {time.perf_counter() - started:6.2f} s")
+    assert json.loads(out)["incidents"] == dicts, "round trip is not lossless"
+    print("  round trip: lossless")
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Benchmark slotted records against plain dicts.")
+    parser.add_argument("--bench", type=int, default=100000, help="Number of incidents in the synthetic history.")
+    parser.add_argument("--sample", default=str(Path(__file__).resolve().parents[1] / "public" / "incidents.json"),
+                        help="incidents.json whose records are replicated to build the history.")
+    args = parser.parse_args()
+    _bench(args.bench, args.sample)
@@ -160,7 +160,8 @@ def main():
         with open(sys.argv[1], 'r') as f:
             data = json.load(f)
 
-        incidents = data.get('incidents', [])
+        # Accepts incidents.json or a change-feed delta (public/changes/delta-*.json)
+        incidents = data.get('incidents', data.get('upserts', []))
         send_slack_alert(incidents, webhook_url)
 
     except Exception as e:
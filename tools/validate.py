@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Validate incidents against public/incidents.schema.json before publishing.
+
+The schema is compiled once into nested closures covering the keywords it uses
+(type, enum, required, properties, items, minimum, maximum, format=date-time).
+Unsupported keywords raise at compile time rather than being silently ignored.
+Ingest validates only the incidents added or changed in a run and moves invalid
+ones to a quarantine file; ``--full`` re-checks a whole document for CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from records import as_dict, incident_id
+
+ROOT = Path(__file__).resolve().parents[1]
+SCHEMA_PATH = ROOT / "public" / "incidents.schema.json"
+QUARANTINE_PATH = ROOT / "data" / "quarantine" / "incidents.ndjson"
+
+Error = Tuple[str, str]
+Check = Callable[[object, str, List[Error]], None]
+
+IGNORED_KEYWORDS = {"$schema", "$id", "title", "description", "$comment", "examples", "default"}
+DATE_TIME = re.compile(
+    r"^\d{4}-\d{2}-\d{2}[Tt]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})$"
+)
+
+TYPE_TESTS: Dict[str, Callable[[object], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _valid_date_time(value: str) -> bool:
+    if not DATE_TIME.match(value):
+        return False
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00").replace("z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+def compile_schema(schema: Dict[str, object]) -> Check:
+    """Turn a (sub)schema into a single function appending (path, message) errors."""
+    unknown = set(schema) - IGNORED_KEYWORDS - {
+        "type", "enum", "required", "properties", "items", "minimum", "maximum", "format",
+    }
+    if unknown:
+        raise ValueError(f"unsupported schema keywords: {sorted(unknown)}")
+
+    checks: List[Check] = []
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        tests = [TYPE_TESTS[name] for name in names]
+        label = "|".join(names)
+
+        def check_type(value: object, path: str, errors: List[Error]) -> None:
+            if not any(test(value) for test in tests):
+                errors.append((path, f"expected {label}, got {type(value).__name__}"))
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value: object, path: str, errors: List[Error]) -> None:
+            if value not in allowed:
+                errors.append((path, f"{value!r} not in {allowed}"))
+        checks.append(check_enum)
+
+    if "minimum" in schema or "maximum" in schema:
+        low, high = schema.get("minimum"), schema.get("maximum")
+
+        def check_range(value: object, path: str, errors: List[Error]) -> None:
+            if not TYPE_TESTS["number"](value):
+                return
+            if low is not None and value < low:
+                errors.append((path, f"{value} < minimum {low}"))
+            if high is not None and value > high:
+                errors.append((path, f"{value} > maximum {high}"))
+        checks.append(check_range)
+
+    if schema.get("format") == "date-time":
+        def check_format(value: object, path: str, errors: List[Error]) -> None:
+            if isinstance(value, str) and not _valid_date_time(value):
+                errors.append((path, f"{value!r} is not an RFC 3339 date-time"))
+        checks.append(check_format)
+
+    required = list(schema.get("required", []))
+    properties = {name: compile_schema(sub) for name, sub in schema.get("properties", {}).items()}
+    if required or properties:
+        def check_object(value: object, path: str, errors: List[Error]) -> None:
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    errors.append((f"{path}.{name}", "required property missing"))
+            for name, check in properties.items():
+                if name in value:
+                    check(value[name], f"{path}.{name}", errors)
+        checks.append(check_object)
+
+    if "items" in schema:
+        item_check = compile_schema(schema["items"])
+
+        def check_items(value: object, path: str, errors: List[Error]) -> None:
+            if not isinstance(value, list):
+                return
+            for i, item in enumerate(value):
+                item_check(item, f"{path}[{i}]", errors)
+        checks.append(check_items)
+
+    def check(value: object, path: str, errors: List[Error]) -> None:
+        for fn in checks:
+            fn(value, path, errors)
+    return check
+
+
+class IncidentValidator:
+    """Compiled validators for the whole document and for a single incident."""
+
+    def __init__(self, schema_path: Path = SCHEMA_PATH) -> None:
+        schema = json.loads(schema_path.read_text(encoding="utf-8"))
+        incidents_schema = schema["properties"]["incidents"]
+        envelope = {k: v for k, v in schema.items() if k != "properties"}
+        envelope["properties"] = {k: v for k, v in schema["properties"].items() if k != "incidents"}
+        self.check_envelope = compile_schema(envelope)
+        self.check_incidents_type = compile_schema({k: v for k, v in incidents_schema.items() if k != "items"})
+        self.check_incident = compile_schema(incidents_schema["items"])
+
+    def incident_errors(self, incident: object, path: str = "$") -> List[Error]:
+        errors: List[Error] = []
+        self.check_incident(incident, path, errors)
+        return errors
+
+    def document_errors(self, doc: object) -> List[Error]:
+        errors: List[Error] = []
+        self.check_envelope(doc, "$", errors)
+        if isinstance(doc, dict) and "incidents" in doc:
+            self.check_incidents_type(doc["incidents"], "$.incidents", errors)
+            if isinstance(doc["incidents"], list):
+                for i, incident in enumerate(doc["incidents"]):
+                    self.check_incident(incident, f"$.incidents[{i}]", errors)
+        return errors
+
+
+def quarantine(records: Iterable[Tuple[Dict[str, object], List[Error]]], path: Path = QUARANTINE_PATH) -> int:
+    stamp = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    count = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fh:
+        for incident, errors in records:
+            fh.write(json.dumps({
+                "quarantined_utc": stamp,
+                "id": incident.get("id") if isinstance(incident, dict) else None,
+                "errors": [{"path": p, "message": m} for p, m in errors],
+                "incident": incident,
+            }, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def validate_for_publish(
+    incidents: List[object],
+    check_ids: Optional[set] = None,
+    validator: Optional[IncidentValidator] = None,
+    previous: Optional[Dict[str, object]] = None,
+) -> List[object]:
+    """Return the incidents safe to publish; invalid ones (limited to ``check_ids`` if given) are quarantined.
+
+    ``previous`` maps ids of already-published incidents to their version from
+    before this run. An invalid update to one of them is quarantined and the
+    previous version stays published; only incidents new in this run are dropped.
+    """
+    validator = validator or IncidentValidator()
+    previous = previous or {}
+    keep: List[object] = []
+    rejected: List[Tuple[Dict[str, object], List[Error]]] = []
+    checked = 0
+    for incident in incidents:
+        uid = incident_id(incident)
+        if check_ids is not None and uid not in check_ids:
+            keep.append(incident)
+            continue
+        checked += 1
+        plain = as_dict(incident)
+        errors = validator.incident_errors(plain)
+        if not errors:
+            keep.append(incident)
+            continue
+        rejected.append((plain, errors))
+        if uid in previous:
+            keep.append(previous[uid])
+    if rejected:
+        quarantine(rejected)
+        for incident, errors in rejected:
+            path, message = errors[0]
+            action = "kept previous version" if str(incident.get("id")) in previous else "withheld"
+            print(f"[warn] quarantined {incident.get('id')} ({action}): {path}: {message}", file=sys.stderr)
+    print(f"[info] validated {checked} incidents, quarantined {len(rejected)}")
+    return keep
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate an incidents document against the schema.")
+    parser.add_argument("path", type=Path, nargs="?", default=ROOT / "public" / "incidents.json")
+    parser.add_argument("--schema", type=Path, default=SCHEMA_PATH)
+    parser.add_argument("--full", action="store_true",
+                        help="Check every incident and exit non-zero on any error (CI mode).")
+    parser.add_argument("--quarantine", action="store_true",
+                        help="Move invalid incidents to the quarantine file and rewrite the document.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    validator = IncidentValidator(args.schema)
+    doc = json.loads(args.path.read_text(encoding="utf-8"))
+    if args.quarantine:
+        doc["incidents"] = validate_for_publish(doc.get("incidents", []), validator=validator)
+        args.path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+        return
+    errors = validator.document_errors(doc)
+    for path, message in errors[:50]:
+        print(f"{path}: {message}")
+    if len(errors) > 50:
+        print(f"... {len(errors) - 50} more errors")
+    print(f"{args.path}: {len(errors)} schema errors")
+    if args.full and errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()